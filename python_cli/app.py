@@ -1,15 +1,18 @@
-from flask import Flask, render_template, request, flash, jsonify, get_flashed_messages, redirect, url_for, session
+from flask import Flask, Response, render_template, request, flash, jsonify, get_flashed_messages, redirect, url_for, session
 from task_manager import TaskManager  # Ensure task_manager.py exists
 import os
 import threading
 import logging
 from werkzeug.utils import secure_filename
+from recipients import count_recipients, store_recipient_file
+from archiver import COMPRESSION_FORMATS
 
 app = Flask(__name__)
 app.secret_key = "your_secret_key"  # Required for flashing messages
 
-# Initialize TaskManager
-manager = TaskManager()
+# TaskManager, created on first use by init_manager()
+manager = None
+manager_lock = threading.Lock()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,9 +29,23 @@ def start_scheduler():
     manager.start_scheduler()
 
 
-# Start the scheduler in a separate thread
-scheduler_thread = threading.Thread(target=start_scheduler, daemon=True)
-scheduler_thread.start()
+def init_manager():
+    """Create the TaskManager and start the scheduler thread, once.
+
+    Not done at import time: "cpu" worker processes are spawned and re-import
+    this module, and must not start a second scheduler.
+    """
+    global manager
+    with manager_lock:
+        if manager is None:
+            manager = TaskManager()
+            threading.Thread(target=start_scheduler, daemon=True).start()
+    return manager
+
+
+@app.before_request
+def ensure_manager():
+    init_manager()
 
 
 @app.route("/", methods=["GET"])
@@ -56,15 +73,16 @@ def index():
                     return render_template("index.html", tasks=tasks, messages=get_flash_messages())
 
             interval = int(interval)
+            trigger = "watch" if request.form.get("trigger") == "watch" else None
 
             # Organize Files
             if task_type == "organize_files":
                 directory = request.form.get("directory")
                 if not directory:
                     flash("Directory is required for organizing files.", "error")
-                elif manager.add_task(interval, unit, task_type, directory=directory):
+                elif manager.add_task(interval, unit, task_type, directory=directory, trigger=trigger):
                     flash("Task added successfully!", "success")
-                    manager.log_to_mongodb("add_task", {"task_type": task_type, "directory": directory, "interval": interval, "unit": unit}, "Task added")
+                    manager.log_to_mongodb("add_task", {"task_type": task_type, "directory": directory, "trigger": trigger or "interval", "interval": interval, "unit": unit}, "Task added")
                 else:
                     flash("Task already exists!", "error")
 
@@ -79,9 +97,9 @@ def index():
                 else:
                     age_days = int(age_days)
                     formats = formats.split(",")
-                    if manager.add_task(interval, unit, task_type, directory=directory, age_days=age_days, formats=formats):
+                    if manager.add_task(interval, unit, task_type, directory=directory, age_days=age_days, formats=formats, trigger=trigger):
                         flash("Task added successfully!", "success")
-                        manager.log_to_mongodb("add_task", {"task_type": task_type, "directory": directory, "age_days": age_days, "formats": formats, "interval": interval, "unit": unit}, "Task added")
+                        manager.log_to_mongodb("add_task", {"task_type": task_type, "directory": directory, "age_days": age_days, "formats": formats, "trigger": trigger or "interval", "interval": interval, "unit": unit}, "Task added")
                     else:
                         flash("Task already exists!", "error")
 
@@ -90,19 +108,18 @@ def index():
                 recipient_file = request.files.get("recipient_file")
                 recipient_emails = []
 
-                if recipient_file:
+                if recipient_file and recipient_file.filename:
                     try:
-                        for line in recipient_file.readlines():
-                            line = line.strip().decode("utf-8")
-                            parts = line.split(',')  # Split the line by commas
-                            if len(parts) == 2:  # Check if it has both name and email
-                                email = parts[1].strip()  # Extract and clean the email
-                                if manager.is_valid_email(email):
-                                    recipient_emails.append(email)
-                                else:
-                                    logging.warning(f"Invalid email: {email}")  # Log invalid emails
-                            else:
-                                logging.warning(f"Invalid line in recipient file: {line}")  # Log invalid lines
+                        # Stream the upload to disk and validate it chunk by chunk; the task
+                        # keeps the stored file path and send_email streams it at run time.
+                        recipient_path = store_recipient_file(recipient_file.stream, recipient_file.filename, UPLOAD_DIR)
+                        valid_count, invalid_count = count_recipients(recipient_path)
+                        if invalid_count:
+                            logging.warning(f"{invalid_count} invalid rows in recipient file '{recipient_file.filename}'")
+                        if not valid_count:
+                            flash("No valid email addresses found in recipient file.", "error")
+                            return render_template("index.html", tasks=tasks, messages=get_flash_messages())
+                        recipient_emails = recipient_path
                     except Exception as e:
                         flash(f"Error processing recipient file: {e}", "error")
                         return render_template("index.html", tasks=tasks, messages=get_flash_messages())
@@ -174,13 +191,28 @@ def index():
                 directory = request.form.get("directory")
                 output_dir = request.form.get("output_dir")
                 compression_format = request.form.get("compression_format")
+                compression_level = request.form.get("compression_level")
+                include = [p.strip() for p in request.form.get("include", "").split(",") if p.strip()]
+                exclude = [p.strip() for p in request.form.get("exclude", "").split(",") if p.strip()]
 
                 if not directory or not output_dir or not compression_format:
                     flash("All fields are required for file compression.", "error")
+                elif compression_format not in COMPRESSION_FORMATS:
+                    flash(f"Unsupported compression format '{compression_format}'.", "error")
                 else:
                     output_dir = output_dir.strip().strip('"')
 
-                    if manager.add_task(interval, unit, task_type, directory=directory, output_dir=output_dir, compression_format=compression_format):
+                    if manager.add_task(
+                        interval,
+                        unit,
+                        task_type,
+                        directory=directory,
+                        output_dir=output_dir,
+                        compression_format=compression_format,
+                        compression_level=int(compression_level) if compression_level else None,
+                        include=include or None,
+                        exclude=exclude or None,
+                    ):
                         flash("Task added successfully!", "success")
                         manager.log_to_mongodb("add_task", {"task_type": task_type, "directory": directory, "output_dir": output_dir, "compression_format": compression_format, "interval": interval, "unit": unit}, "Task added")
                     else:
@@ -244,10 +276,72 @@ def remove_task(task_name):
         return redirect(url_for('index'))
 
 
+@app.route("/profile_task/", methods=["POST"])
+def profile_task():
+    """Profile the next N scheduled runs of a task (0 switches profiling off)."""
+    task_name = (request.form.get("task_name") or "").strip()
+    try:
+        runs = int(request.form.get("runs") or 1)
+        if not task_name:
+            flash("Task name is required!", "error")
+        elif runs < 0:
+            flash("Number of runs must be 0 or more!", "error")
+        elif manager.set_task_profiling(task_name, runs):
+            if runs:
+                flash(f"Profiling the next {runs} run(s) of {task_name}; reports go to '{manager.profile_dir}'.", "success")
+            else:
+                flash(f"Profiling of {task_name} switched off.", "success")
+        else:
+            flash("Task not found!", "error")
+    except Exception as e:
+        logger.error(f"Error setting task profiling: {e}")
+        flash(f"Error setting task profiling: {e}", "error")
+    return redirect(url_for('index'))
+
+
+@app.route("/api/gold_rates", defaults={"query": "summary"}, methods=["GET"])
+@app.route("/api/gold_rates/<query>", methods=["GET"])
+def gold_rates(query):
+    """Serve gold price analytics (ohlc, rolling, pct-change, summary) from the in-memory history."""
+    try:
+        result = manager.gold_rate_analytics(
+            query,
+            window=request.args.get("window"),
+            periods=request.args.get("periods", 1, type=int),
+            start=request.args.get("start"),
+            end=request.args.get("end"),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error computing gold rate analytics: {e}")
+        return jsonify({"error": str(e)}), 500
+    return jsonify({"query": query, "result": result})
+
+
+@app.route("/api/job_stats", methods=["GET"])
+def job_stats():
+    """Serve queue lag, queued runs and skipped runs per scheduled job."""
+    return jsonify(manager.job_stats())
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Expose job run metrics in the Prometheus text format."""
+    return Response(manager.metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/api/metrics", methods=["GET"])
+def metrics_summary():
+    """Serve a JSON summary of job run metrics per task."""
+    return jsonify(manager.metrics.summary())
+
+
 def get_flash_messages():
     """Get flashed messages and format them for JSON response."""
     return [{"category": category, "message": message} for category, message in get_flashed_messages(with_categories=True)]
 
 
 if __name__ == "__main__":
+    init_manager()
     app.run(debug=False)  # Enable debug mode for development
\ No newline at end of file
@@ -0,0 +1,236 @@
+import fnmatch
+import io
+import json
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+
+from parallel_zip import write_parallel_zip, write_serial_zip
+
+ARCHIVE_EXTENSIONS = {
+    "zip": ".zip",
+    "tar": ".tar",
+    "tar.gz": ".tar.gz",
+    "tar.bz2": ".tar.bz2",
+    "tar.xz": ".tar.xz",
+}
+COMPRESSION_FORMATS = list(ARCHIVE_EXTENSIONS)
+# tarfile write mode per tar format
+TAR_MODES = {"tar": "w", "tar.gz": "w:gz", "tar.bz2": "w:bz2", "tar.xz": "w:xz"}
+DELETED_MEMBER = ".deleted.json"
+
+
+def archive_extension(compression_format):
+    try:
+        return ARCHIVE_EXTENSIONS[compression_format]
+    except KeyError:
+        raise ValueError("Unsupported compression format") from None
+
+
+def _matches(rel, name, patterns):
+    return any(fnmatch.fnmatch(rel, pattern) or fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def scan_tree(directory, exclude_dirs=(), include=None, exclude=None):
+    """Return {relative path: (absolute path, size, mtime_ns)} for every file under `directory`.
+
+    `include` and `exclude` are glob lists matched against the relative path
+    (with `/` separators) or the bare name. Excluded directories are not
+    descended into; when `include` is given only matching files are kept.
+    """
+    skip_dirs = {os.path.abspath(d) for d in exclude_dirs}
+    include = list(include or [])
+    exclude = list(exclude or [])
+    files = {}
+    stack = [os.path.abspath(directory)]
+    root = stack[0]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                rel = os.path.relpath(entry.path, root).replace(os.sep, "/")
+                if exclude and _matches(rel, entry.name, exclude):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path not in skip_dirs:
+                        stack.append(entry.path)
+                elif entry.is_file():
+                    if include and not _matches(rel, entry.name, include):
+                        continue
+                    st = entry.stat()
+                    files[rel] = (entry.path, st.st_size, st.st_mtime_ns)
+    return files
+
+
+def _open_tar(path, compression_format, level=None):
+    mode = TAR_MODES[compression_format]
+    if level is None or compression_format == "tar":
+        return tarfile.open(path, mode)
+    if compression_format == "tar.xz":
+        return tarfile.open(path, mode, preset=int(level))
+    return tarfile.open(path, mode, compresslevel=int(level))
+
+
+def write_archive(output_path, compression_format, members, extra_members=None, workers=1, level=None):
+    """Write `members` ({arcname: (path, size, mtime_ns)}) and in-memory `extra_members` to an archive.
+
+    Zip members are stored uncompressed unless a deflate `level` is given; with
+    `workers` > 1 they are deflated in a thread pool (see parallel_zip). For the
+    compressed tar formats `level` is the gzip/bzip2 level or the xz preset.
+    Members are streamed from disk into a temporary file in the output directory
+    that replaces `output_path` only once complete.
+    """
+    archive_extension(compression_format)
+    tmp_path = os.path.join(
+        os.path.dirname(output_path) or ".", f".{os.path.basename(output_path)}.{os.getpid()}.tmp"
+    )
+    try:
+        if compression_format == "zip":
+            if workers and workers > 1:
+                write_parallel_zip(tmp_path, members, workers=workers, level=level, extra_members=extra_members)
+            else:
+                write_serial_zip(tmp_path, members, level=level, extra_members=extra_members)
+        else:
+            with _open_tar(tmp_path, compression_format, level) as tarf:
+                for arcname, (path, _, _) in sorted(members.items()):
+                    tarf.add(path, arcname=arcname, recursive=False)
+                for arcname, data in (extra_members or {}).items():
+                    info = tarfile.TarInfo(arcname)
+                    info.size = len(data)
+                    info.mtime = int(time.time())
+                    tarf.addfile(info, io.BytesIO(data))
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _iter_archive(path, compression_format):
+    """Yield `(arcname, open_member)` for the regular files of an archive."""
+    if compression_format == "zip":
+        with zipfile.ZipFile(path) as zipf:
+            for info in zipf.infolist():
+                if not info.is_dir():
+                    yield info.filename, (lambda info=info: zipf.open(info)), info
+    else:
+        with tarfile.open(path) as tarf:
+            for info in tarf:
+                if info.isfile():
+                    yield info.name, (lambda info=info: tarf.extractfile(info)), info
+
+
+def _read_deleted(path, compression_format):
+    for arcname, open_member, _ in _iter_archive(path, compression_format):
+        if arcname == DELETED_MEMBER:
+            with open_member() as f:
+                return set(json.load(f))
+    return set()
+
+
+class ArchiveState:
+    """What went into the last full archive and the differential archives after it.
+
+    Stored next to the archives as `.<base name>.state.json`; `files` maps each
+    archived relative path to `[size, mtime_ns]` as of the latest archive.
+    """
+
+    def __init__(self, output_dir, base_name, compression_format):
+        self.output_dir = output_dir
+        self.compression_format = compression_format
+        self.extension = archive_extension(compression_format)
+        self.base_name = base_name
+        self.base_path = os.path.join(output_dir, base_name + self.extension)
+        self.path = os.path.join(output_dir, f".{base_name}{self.extension}.state.json")
+        self.files = {}
+        self.deltas = []
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.files = {k: tuple(v) for k, v in data.get("files", {}).items()}
+            self.deltas = data.get("deltas", [])
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    @property
+    def has_base(self):
+        return bool(self.files) and os.path.exists(self.base_path)
+
+    def delta_paths(self):
+        return [os.path.join(self.output_dir, name) for name in self.deltas]
+
+    def new_delta_path(self):
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        name = f"{self.base_name}.delta-{stamp}-{len(self.deltas) + 1:04d}{self.extension}"
+        return os.path.join(self.output_dir, name)
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"files": self.files, "deltas": self.deltas}, f)
+        os.replace(tmp_path, self.path)
+
+
+def diff_tree(state, current):
+    """Return (changed members, deleted relative paths) of `current` against `state`."""
+    changed = {
+        rel: member for rel, member in current.items()
+        if state.files.get(rel) != (member[1], member[2])
+    }
+    deleted = sorted(rel for rel in state.files if rel not in current)
+    return changed, deleted
+
+
+def consolidate(state):
+    """Merge the base archive and its deltas into a new full base archive.
+
+    The newest copy of every path wins, and paths recorded as deleted in a delta
+    are dropped. Returns the number of members in the consolidated archive.
+    """
+    archives = [state.base_path] + state.delta_paths()
+    tmp_path = state.base_path + ".consolidating"
+    seen = set()
+    dropped = set()
+    count = 0
+    fmt = state.compression_format
+
+    if fmt == "zip":
+        out = zipfile.ZipFile(tmp_path, "w")
+    else:
+        out = _open_tar(tmp_path, fmt)
+    try:
+        with out:
+            for archive in reversed(archives):
+                deleted = _read_deleted(archive, fmt) if archive != state.base_path else set()
+                for arcname, open_member, info in _iter_archive(archive, fmt):
+                    if arcname == DELETED_MEMBER or arcname in seen or arcname in dropped:
+                        continue
+                    seen.add(arcname)
+                    with open_member() as src:
+                        if fmt == "zip":
+                            member = zipfile.ZipInfo(arcname, info.date_time)
+                            member.compress_type = info.compress_type
+                            with out.open(member, "w") as dst:
+                                shutil.copyfileobj(src, dst, 1024 * 1024)
+                        else:
+                            out.addfile(info, src)
+                    count += 1
+                # A deletion only hides copies from older archives.
+                dropped |= deleted - seen
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    os.replace(tmp_path, state.base_path)
+    for delta in state.delta_paths():
+        try:
+            os.remove(delta)
+        except FileNotFoundError:
+            pass
+    state.deltas = []
+    state.save()
+    return count
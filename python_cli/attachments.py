@@ -0,0 +1,225 @@
+import atexit
+import base64
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from email import policy
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+# 57 raw bytes encode to one 76-character base64 line; read whole lines at a time.
+_RAW_CHUNK = 57 * 1024
+
+
+class EncodedAttachment:
+    """A file encoded once as the base64 body of a MIME part.
+
+    The encoded body (CRLF line endings, no trailing newline) is kept in memory,
+    or spooled to a temporary file when it does not fit the cache's memory budget
+    and streamed from there on every send.
+    """
+
+    def __init__(self, path, key, data=None, spool_path=None, encoded_size=0):
+        self.path = path
+        self.filename = os.path.basename(path)
+        self.key = key
+        self.data = data
+        self.spool_path = spool_path
+        self.encoded_size = encoded_size
+        self.refs = 0  # senders currently using this entry (see AttachmentCache.release)
+        self.retired = False
+
+    @property
+    def in_memory(self):
+        return self.data is not None
+
+    def chunks(self, chunk_size=1024 * 1024):
+        """Yield the encoded body in chunks."""
+        if self.data is not None:
+            yield self.data
+            return
+        with open(self.spool_path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def discard(self):
+        if self.spool_path:
+            try:
+                os.remove(self.spool_path)
+            except OSError:
+                pass
+            self.spool_path = None
+        self.data = None
+
+
+def _encode_chunks(f):
+    previous = None
+    while True:
+        raw = f.read(_RAW_CHUNK)
+        if not raw:
+            break
+        if previous is not None:
+            yield previous + b"\r\n"
+        previous = base64.encodebytes(raw).rstrip(b"\n").replace(b"\n", b"\r\n")
+    if previous is not None:
+        yield previous
+
+
+class AttachmentCache:
+    """LRU cache of encoded attachments keyed by path, size and mtime.
+
+    Each attachment is read and base64-encoded once; later sends (and later runs,
+    until the file changes) reuse the encoded body. Encoded bodies are held in
+    memory up to `max_memory_bytes` in total; anything beyond that is spooled to
+    disk and streamed. Least recently used entries are evicted to stay within
+    `max_entries` and `max_spool_bytes` of spool files, and to make room in memory.
+
+    `get` pins the entry it returns until it is handed back to `release`. A pinned
+    entry is never evicted, and one replaced because its file changed is only
+    discarded once its last sender releases it.
+    """
+
+    def __init__(self, max_memory_bytes=32 * 1024 * 1024, spool_dir=None,
+                 max_spool_bytes=1024 * 1024 * 1024, max_entries=256):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_spool_bytes = max_spool_bytes
+        self.max_entries = max(1, int(max_entries))
+        self.spool_dir = spool_dir
+        self._entries = OrderedDict()
+        self._memory_bytes = 0
+        self._spool_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "encoded": 0, "spooled": 0, "evicted": 0}
+        atexit.register(self.clear)
+
+    def get(self, path):
+        """Return the EncodedAttachment for `path`, encoding it if needed, and pin it."""
+        real_path = os.path.realpath(path)
+        st = os.stat(real_path)
+        key = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            entry = self._entries.get(real_path)
+            if entry is not None and entry.key == key:
+                self._stats["hits"] += 1
+                self._entries.move_to_end(real_path)
+                entry.refs += 1
+                return entry
+            if entry is not None:
+                self._retire(real_path)
+            # base64 grows data by 4/3 plus two bytes of CRLF per 76-character line.
+            estimated = (st.st_size + 2) // 3 * 4 + (st.st_size // 57 + 1) * 2
+            self._evict(estimated if estimated <= self.max_memory_bytes else 0)
+            entry = self._encode(path, real_path, key, estimated)
+            entry.refs = 1
+            self._entries[real_path] = entry
+            self._evict()
+            return entry
+
+    def release(self, entries):
+        """Unpin entries returned by `get`."""
+        with self._lock:
+            for entry in entries:
+                entry.refs -= 1
+                if not entry.refs and entry.retired:
+                    self._discard(entry)
+            self._evict()
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "memory_bytes": self._memory_bytes,
+                "spool_bytes": self._spool_bytes,
+            }
+
+    def clear(self):
+        """Discard every entry, pinned or not (used at interpreter exit)."""
+        with self._lock:
+            for entry in self._entries.values():
+                entry.retired = True
+                self._discard(entry)
+            self._entries.clear()
+
+    def _evict(self, incoming_memory=0):
+        """Retire unpinned entries, least recently used first, while over a limit."""
+        for real_path, entry in list(self._entries.items()):
+            if entry.refs:
+                continue
+            too_many = len(self._entries) > self.max_entries
+            spool_full = not entry.in_memory and self._spool_bytes > self.max_spool_bytes
+            memory_full = entry.in_memory and incoming_memory and self._memory_bytes + incoming_memory > self.max_memory_bytes
+            if too_many or spool_full or memory_full:
+                self._retire(real_path)
+                self._stats["evicted"] += 1
+
+    def _retire(self, real_path):
+        """Drop an entry from the cache; its data goes once no sender holds it."""
+        entry = self._entries.pop(real_path)
+        entry.retired = True
+        if not entry.refs:
+            self._discard(entry)
+
+    def _discard(self, entry):
+        if entry.in_memory:
+            self._memory_bytes -= entry.encoded_size
+        elif entry.spool_path:
+            self._spool_bytes -= entry.encoded_size
+        entry.discard()
+
+    def _encode(self, path, real_path, key, estimated):
+        self._stats["encoded"] += 1
+        with open(real_path, "rb") as f:
+            if self._memory_bytes + estimated <= self.max_memory_bytes:
+                data = b"".join(_encode_chunks(f))
+                self._memory_bytes += len(data)
+                return EncodedAttachment(path, key, data=data, encoded_size=len(data))
+
+            fd, spool_path = tempfile.mkstemp(prefix="attachment-", suffix=".b64", dir=self.spool_dir)
+            encoded_size = 0
+            with os.fdopen(fd, "wb") as out:
+                for chunk in _encode_chunks(f):
+                    out.write(chunk)
+                    encoded_size += len(chunk)
+        self._stats["spooled"] += 1
+        self._spool_bytes += encoded_size
+        return EncodedAttachment(path, key, spool_path=spool_path, encoded_size=encoded_size)
+
+
+def compose_message(sender, recipients, subject, body, attachments=()):
+    """Build a message as a list of segments: bytes and EncodedAttachment bodies.
+
+    Only the headers and the text part are generated per call; attachment bodies
+    are referenced, not copied, so the caller can stream them.
+    """
+    msg = MIMEMultipart(policy=policy.SMTP)
+    msg["From"] = sender
+    msg["To"] = ", ".join(recipients)
+    msg["Subject"] = subject
+    msg.attach(MIMEText(body, "plain", policy=policy.SMTP))
+
+    placeholders = {}
+    for attachment in attachments:
+        token = f"@@attachment-{uuid.uuid4().hex}@@"
+        placeholders[token.encode("ascii")] = attachment
+        part = MIMEBase("application", "octet-stream", policy=policy.SMTP)
+        part["Content-Transfer-Encoding"] = "base64"
+        part.add_header("Content-Disposition", "attachment", filename=attachment.filename)
+        part.set_payload(token)
+        msg.attach(part)
+
+    raw = msg.as_bytes()
+    segments = []
+    for token, attachment in placeholders.items():
+        head, raw = raw.split(token, 1)
+        segments.append(head)
+        segments.append(attachment)
+    segments.append(raw)
+    return segments
+
@@ -0,0 +1,437 @@
+import email.utils
+import http.server
+import os
+import platform
+import random
+import shutil
+import socketserver
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, max_rss_kb is left out of the report
+    resource = None
+
+BENCH_TASKS = ("organize_files", "delete_files", "convert_file", "compress_files", "send_email", "get_gold_rate")
+
+# Extensions of the synthetic files, spread over the default organize_files categories.
+_EXTENSIONS = (".jpg", ".png", ".mp4", ".pdf", ".txt", ".docx", ".mp3", ".zip", ".py", ".csv", ".json", ".log", ".bak")
+_WORDS = b"gold rate task file archive report invoice photo backup scheduler email convert".split()
+
+
+class MemoryCollection:
+    """Stand-in for the Mongo logs collection: counts what would have been inserted."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def insert_one(self, doc):
+        self.insert_many([doc])
+
+    def insert_many(self, docs, ordered=True):
+        with self._lock:
+            self.count += len(docs)
+
+
+class MemoryMongoClient:
+    """Stand-in for pymongo.MongoClient handing out MemoryCollections."""
+
+    def __init__(self, uri=None, **kwargs):
+        self.collection = MemoryCollection()
+
+    def __getitem__(self, name):
+        return {"logs": self.collection}
+
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.wfile.write(b"220 bench SMTP sink\r\n")
+        in_data = False
+        data = []
+        session_messages = 0
+        for line in self.rfile:
+            if in_data:
+                if line.rstrip(b"\r\n") == b".":
+                    in_data = False
+                    self.server.count_message(b"".join(data))
+                    data = []
+                    session_messages += 1
+                    self.wfile.write(b"250 OK queued\r\n")
+                    if self.server.disconnect_after and session_messages >= self.server.disconnect_after:
+                        return  # drop the session without QUIT
+                elif self.server.keep_messages:
+                    data.append(line[1:] if line.startswith(b"..") else line)  # undo dot-stuffing
+                continue
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.wfile.write(b"250-bench\r\n250 8BITMIME\r\n")
+            elif command == b"DATA":
+                in_data = True
+                self.wfile.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+            elif command == b"QUIT":
+                self.wfile.write(b"221 Bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 OK\r\n")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Local SMTP server that accepts every message (no TLS, no AUTH).
+
+    Messages are counted and discarded, or kept in `received` with
+    `keep_messages`. With `disconnect_after` the server drops each session
+    after that many messages, like a server closing long-lived connections.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, keep_messages=False, disconnect_after=None):
+        super().__init__(("127.0.0.1", 0), _SMTPSinkHandler)
+        self.keep_messages = keep_messages
+        self.disconnect_after = disconnect_after
+        self.messages = 0
+        self.received = []
+        self._lock = threading.Lock()
+
+    def count_message(self, data=b""):
+        with self._lock:
+            self.messages += 1
+            if self.keep_messages:
+                self.received.append(data)
+
+
+class _GoldRateHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+
+    def do_GET(self):
+        price = self.server.next_price()
+        etag = f'"{price}"'
+        if_none_match = self.headers.get("If-None-Match")
+        self.server.conditional_headers.append((if_none_match, self.headers.get("If-Modified-Since")))
+        if if_none_match == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)  # no Last-Modified: clients keep the one they have
+            self.end_headers()
+            return
+        body = (
+            "<html><head><title>Gold Rate Today</title></head><body>"
+            + "".join(f"<p class='filler'>Market update {i}</p>" for i in range(200))
+            + f"<div><span class='rate white-space-nowrap'>&#8377;{price:,}</span></div>"
+            + "</body></html>"
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.server.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class GoldRateServer(http.server.ThreadingHTTPServer):
+    """Local HTTP server serving a gold-rate page whose price changes on every request.
+
+    With `changing=False` the price stays put and requests carrying its ETag
+    get a 304. The If-None-Match / If-Modified-Since headers of every request
+    are recorded in `conditional_headers`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, changing=True):
+        super().__init__(("127.0.0.1", 0), _GoldRateHandler)
+        self.changing = changing
+        self.last_modified = email.utils.formatdate(usegmt=True)
+        self.conditional_headers = []
+        self._price = 6000
+        self._lock = threading.Lock()
+
+    def next_price(self):
+        with self._lock:
+            if self.changing:
+                self._price += 1
+            return self._price
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/gold-rate.html"
+
+
+def _serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def make_tree(root, files, dirs=10, file_size=4096, seed=0, old_fraction=0.5, age_days=60):
+    """Create a reproducible tree of `files` files over `dirs` subdirectories; return total bytes.
+
+    Contents are half random bytes, half repeated words (so they compress
+    realistically), and `old_fraction` of the files get an mtime `age_days` old.
+    """
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    subdirs = [root] + [os.path.join(root, f"dir_{i:03d}") for i in range(max(0, dirs - 1))]
+    for subdir in subdirs:
+        os.makedirs(subdir, exist_ok=True)
+    old = time.time() - age_days * 86400
+    total = 0
+    for i in range(files):
+        path = os.path.join(subdirs[i % len(subdirs)], f"file_{i:06d}{rng.choice(_EXTENSIONS)}")
+        half = file_size // 2
+        text = b" ".join(rng.choice(_WORDS) for _ in range(half // 6 + 1))[:file_size - half]
+        with open(path, "wb") as f:
+            f.write(rng.randbytes(half) + text)
+        if rng.random() < old_fraction:
+            os.utime(path, (old, old))
+        total += file_size
+    return total
+
+
+def make_csv_files(root, files, rows=200, seed=0):
+    """Create `files` small CSV files for convert_file (csv -> xlsx)."""
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    for i in range(files):
+        with open(os.path.join(root, f"table_{i:05d}.csv"), "w", encoding="utf-8") as f:
+            f.write("id,name,amount,date\n")
+            for row in range(rows):
+                f.write(f"{row},{rng.choice(_WORDS).decode()},{rng.uniform(0, 10000):.2f},2024-01-{row % 28 + 1:02d}\n")
+
+
+def make_recipients(path, count, seed=0, invalid_fraction=0.02):
+    """Write a `name,email` recipient CSV with a few invalid addresses."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("name,email\n")
+        for i in range(count):
+            email = f"user{i}@example.com" if rng.random() >= invalid_fraction else f"user{i}-at-example"
+            f.write(f"User {i},{email}\n")
+
+
+def _percentiles(values):
+    values = np.asarray(values, dtype="float64")
+    return {
+        "min": round(float(values.min()), 6),
+        "p50": round(float(np.percentile(values, 50)), 6),
+        "p95": round(float(np.percentile(values, 95)), 6),
+        "max": round(float(values.max()), 6),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class _Bench:
+    """One benchmark: `setup()` (untimed) then `run()` (timed), repeated."""
+
+    def __init__(self, items, unit, setup, run, latencies=None):
+        self.items = items
+        self.unit = unit
+        self.setup = setup
+        self.run = run
+        self.latencies = latencies  # per-operation latencies collected by run(), if any
+
+
+def _measure(bench, repeat):
+    """Run `bench` once under tracemalloc for peak memory, then `repeat` timed runs without it."""
+    bench.setup()
+    tracemalloc.start()
+    try:
+        check = bench.run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    if bench.latencies is not None:
+        bench.latencies.clear()
+    durations = []
+    for _ in range(repeat):
+        bench.setup()
+        started = time.perf_counter()
+        check = bench.run()
+        durations.append(time.perf_counter() - started)
+    median = float(np.median(durations))
+    result = {
+        "items": bench.items,
+        "unit": bench.unit,
+        "runs": [round(d, 6) for d in durations],
+        "seconds": _percentiles(durations),
+        "throughput": round(bench.items / median, 2) if median else None,
+        "throughput_unit": f"{bench.unit}/s",
+        "peak_memory_bytes": peak,
+        "check": check,
+    }
+    if bench.latencies:
+        result["latency_seconds"] = _percentiles(bench.latencies)
+    return result
+
+
+def _benchmarks(manager, work_dir, params, smtp):
+    files = params["files"]
+    tree = os.path.join(work_dir, "tree")
+    seed = params["seed"]
+
+    def fresh_tree():
+        shutil.rmtree(tree, ignore_errors=True)
+        make_tree(tree, files, dirs=params["dirs"], file_size=params["file_size"], seed=seed)
+
+    def organize():
+        summary = manager.organize_files(tree, recursive=True)
+        return {"moved": summary["moved"], "failed": summary["failed"]}
+
+    def delete():
+        summary = manager.delete_files(tree, 30, list(_EXTENSIONS))
+        return {"scanned": summary["files"], "deleted": summary["deleted"], "failed": summary["failed"]}
+
+    csv_dir = os.path.join(work_dir, "csv")
+    xlsx_dir = os.path.join(work_dir, "xlsx")
+    make_csv_files(csv_dir, params["convert_files"], seed=seed)
+
+    def reset_xlsx():
+        shutil.rmtree(xlsx_dir, ignore_errors=True)
+
+    def convert():
+        summary = manager.convert_file(csv_dir, xlsx_dir, "csv", "xlsx")
+        return {"converted": summary["converted"], "failed": summary["failed"]}
+
+    archive_dir = os.path.join(work_dir, "archives")
+
+    def compress():
+        summary = manager.compress_files(tree, archive_dir, params["compression_format"], level=params["compression_level"])
+        return {"files": summary["files"], "archive_bytes": summary["archive_bytes"]}
+
+    recipients = os.path.join(work_dir, "recipients.csv")
+    make_recipients(recipients, params["recipients"], seed=seed)
+
+    def send():
+        before = smtp.messages
+        report = manager.send_email(recipients, "Benchmark", "Hello {name}, this is a benchmark message.")
+        return {"sent": report["sent"], "failed": report["failed"], "invalid": report["invalid"],
+                "received": smtp.messages - before}
+
+    fetch_latencies = []
+
+    def scrape():
+        stored = 0
+        for _ in range(params["fetches"]):
+            started = time.perf_counter()
+            stored += manager.get_gold_rate() is not None
+            fetch_latencies.append(time.perf_counter() - started)
+        return {"stored": stored}
+
+    tree_bytes = files * params["file_size"]
+    return {
+        "organize_files": _Bench(files, "files", fresh_tree, organize),
+        "delete_files": _Bench(files, "files", fresh_tree, delete),
+        "convert_file": _Bench(params["convert_files"], "files", reset_xlsx, convert),
+        "compress_files": _Bench(tree_bytes, "bytes", fresh_tree, compress),
+        "send_email": _Bench(params["recipients"], "recipients", lambda: None, send),
+        "get_gold_rate": _Bench(params["fetches"], "fetches", lambda: None, scrape, latencies=fetch_latencies),
+    }
+
+
+def run_benchmarks(tasks=None, files=1000, dirs=10, file_size=4096, convert_files=20, recipients=500,
+                   fetches=50, repeat=3, seed=0, compression_format="zip", compression_level=None, work_dir=None):
+    """Benchmark each task type against local stand-ins and return a JSON-ready report.
+
+    Every run starts from the same synthetic data (regenerated from `seed`
+    before each run, outside the timing), and the TaskManager talks to a local
+    SMTP sink, a local HTTP server serving a gold-rate page and an in-memory
+    Mongo collection, so results depend only on the code and the machine.
+    """
+    import task_manager
+
+    tasks = list(tasks or BENCH_TASKS)
+    unknown = sorted(set(tasks) - set(BENCH_TASKS))
+    if unknown:
+        raise ValueError(f"Unknown benchmark task(s): {', '.join(unknown)}")
+    params = {
+        "files": files, "dirs": dirs, "file_size": file_size, "convert_files": convert_files,
+        "recipients": recipients, "fetches": fetches, "repeat": repeat, "seed": seed,
+        "compression_format": compression_format, "compression_level": compression_level,
+    }
+    own_dir = work_dir is None
+    work_dir = os.path.abspath(work_dir or tempfile.mkdtemp(prefix="autopygo-bench-"))
+    os.makedirs(work_dir, exist_ok=True)
+    smtp = _serve(SMTPSink())
+    http_server = _serve(GoldRateServer())
+    previous_cwd = os.getcwd()
+    previous_client = task_manager.MongoClient
+    env = {"SENDER_EMAIL": "bench@example.com", "SENDER_PASSWORD": "bench"}
+    previous_env = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    os.chdir(work_dir)  # task store, logs, price history and indexes stay in the work dir
+    task_manager.MongoClient = MemoryMongoClient
+    manager = None
+    try:
+        manager = task_manager.TaskManager(worker=True)
+        manager.smtp_host, manager.smtp_port = smtp.server_address
+        manager.smtp_starttls = False
+        manager.gold_rate_url = http_server.url
+        benchmarks = _benchmarks(manager, work_dir, params, smtp)
+        results = {name: _measure(benchmarks[name], repeat) for name in tasks}
+        manager.log_sink.flush()
+        mongo_logs = manager.client.collection.count
+    finally:
+        task_manager.MongoClient = previous_client
+        if manager is not None:
+            manager._on_scheduler_shutdown(None)  # the scheduler never started; release its resources directly
+        os.chdir(previous_cwd)
+        for key, value in previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        smtp.shutdown()
+        smtp.server_close()
+        http_server.shutdown()
+        http_server.server_close()
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    meta = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "mongo_logs": mongo_logs,
+    }
+    if resource is not None:
+        meta["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"meta": meta, "params": params, "results": results}
+
+
+def compare(report, baseline):
+    """Add each task's throughput and p50 ratios against a baseline report (> 1 = faster now)."""
+    for name, result in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before or not before.get("throughput") or not result.get("throughput"):
+            continue
+        result["vs_baseline"] = {
+            "commit": baseline.get("meta", {}).get("commit"),
+            "throughput_ratio": round(result["throughput"] / before["throughput"], 3),
+            "p50_ratio": round(before["seconds"]["p50"] / result["seconds"]["p50"], 3),
+            "peak_memory_ratio": round(result["peak_memory_bytes"] / before["peak_memory_bytes"], 3)
+            if before.get("peak_memory_bytes") else None,
+        }
+    return report
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = ".convert_manifest.json"
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """Return the SHA-1 of a file's content, read in chunks."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConversionManifest:
+    """Record of what convert_file produced in one output directory.
+
+    Entries are keyed by absolute source path and hold the source size, mtime,
+    optional content hash, the conversion formats and the output path. The
+    manifest lets a run skip sources that have not changed since they were last
+    converted and remove outputs whose source has disappeared.
+    """
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.entries = data.get("entries", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def is_current(self, source, stat, output_path, output_exists, use_hash=False):
+        """Return True if `source` was already converted and has not changed since."""
+        entry = self.entries.get(source)
+        if entry is None or entry.get("output") != output_path or not output_exists:
+            return False
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return True
+        if use_hash and entry.get("hash") and entry["size"] == stat.st_size:
+            # Touched but not modified: refresh the recorded mtime and keep the output.
+            if file_digest(source) == entry["hash"]:
+                entry["mtime_ns"] = stat.st_mtime_ns
+                self.dirty = True
+                return True
+        return False
+
+    def record(self, source, stat, output_path, input_format, output_format, use_hash=False):
+        self.entries[source] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": file_digest(source) if use_hash else None,
+            "input_format": input_format,
+            "output_format": output_format,
+            "output": output_path,
+        }
+        self.dirty = True
+
+    def stale_sources(self, input_dir, input_format, output_format, present):
+        """Return recorded sources of this conversion that no longer exist in `input_dir`."""
+        input_dir = os.path.abspath(input_dir)
+        return [
+            source for source, entry in self.entries.items()
+            if os.path.dirname(source) == input_dir
+            and entry.get("input_format") == input_format
+            and entry.get("output_format") == output_format
+            and source not in present
+        ]
+
+    def remove(self, source):
+        entry = self.entries.pop(source, None)
+        self.dirty = True
+        return entry
+
+    def save(self):
+        """Write the manifest atomically if it changed."""
+        if not self.dirty:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": 1, "entries": self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
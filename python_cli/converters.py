@@ -0,0 +1,123 @@
+import csv
+import importlib
+import os
+import re
+
+import pandas as pd
+from docx import Document
+from fpdf import FPDF
+
+# (input_format, output_format) -> callable(input_path, output_path)
+CONVERTERS = {}
+
+CSV_CHUNK_ROWS = 10000
+SNIFF_BYTES = 64 * 1024
+_WHITESPACE = re.compile(r"\s+")
+
+
+def register_converter(input_format, output_format):
+    """Decorator registering a converter for one (input_format, output_format) pair.
+
+    Converters take `(input_path, output_path)` and should stream their input so
+    memory per file stays bounded. Extra converters can live in separate modules
+    listed in the CONVERTER_PLUGINS environment variable (comma-separated).
+    """
+    def decorator(func):
+        CONVERTERS[(input_format.lower(), output_format.lower())] = func
+        return func
+    return decorator
+
+
+def get_converter(input_format, output_format):
+    try:
+        return CONVERTERS[(input_format.lower(), output_format.lower())]
+    except KeyError:
+        raise ValueError(f"Unsupported conversion format: {input_format} to {output_format}") from None
+
+
+def supported_conversions():
+    return sorted(CONVERTERS)
+
+
+def input_formats():
+    return sorted({input_format for input_format, _ in CONVERTERS})
+
+
+def output_formats():
+    return sorted({output_format for _, output_format in CONVERTERS})
+
+
+def convert(input_path, output_path, input_format, output_format):
+    """Convert a single file. Module-level so it can run in a worker process."""
+    get_converter(input_format, output_format)(input_path, output_path)
+
+
+def _pdf_text(text):
+    # FPDF's core fonts are latin-1 only.
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+
+def _new_pdf():
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    return pdf
+
+
+@register_converter("txt", "pdf")
+def txt_to_pdf(input_path, output_path):
+    pdf = _new_pdf()
+    with open(input_path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            pdf.multi_cell(0, 10, _pdf_text(line.rstrip("\r\n")))
+    pdf.output(output_path)
+
+
+@register_converter("txt", "csv")
+def txt_to_csv(input_path, output_path):
+    with open(input_path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        sample = f.read(SNIFF_BYTES)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",\t;|")
+            rows = csv.reader(f, dialect)
+        except csv.Error:
+            # No consistent delimiter: treat runs of whitespace as the separator.
+            rows = (_WHITESPACE.split(line.strip()) for line in f if line.strip())
+        with open(output_path, "w", encoding="utf-8", newline="") as out:
+            writer = csv.writer(out)
+            for row in rows:
+                writer.writerow(row)
+
+
+@register_converter("csv", "xlsx")
+def csv_to_xlsx(input_path, output_path):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    header_written = False
+    for chunk in pd.read_csv(input_path, chunksize=CSV_CHUNK_ROWS):
+        if not header_written:
+            sheet.append([str(column) for column in chunk.columns])
+            header_written = True
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(output_path)
+
+
+@register_converter("docx", "pdf")
+def docx_to_pdf(input_path, output_path):
+    pdf = _new_pdf()
+    for para in Document(input_path).paragraphs:
+        pdf.multi_cell(0, 10, _pdf_text(para.text))
+    pdf.output(output_path)
+
+
+def _load_plugins():
+    for module_name in filter(None, (name.strip() for name in os.getenv("CONVERTER_PLUGINS", "").split(","))):
+        importlib.import_module(module_name)
+
+
+_load_plugins()
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, parent TEXT, mtime_ns INTEGER);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    inode INTEGER,
+    seq INTEGER
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+CREATE INDEX IF NOT EXISTS files_seq ON files (seq);
+CREATE INDEX IF NOT EXISTS files_ext_mtime ON files (ext, mtime_ns);
+"""
+
+
+def index_path(index_dir, root):
+    """Return the SQLite file holding the index of `root`."""
+    root = os.path.realpath(root)
+    return os.path.join(index_dir, f"{hashlib.sha1(root.encode('utf-8')).hexdigest()[:16]}.sqlite")
+
+
+class DirectoryIndex:
+    """Persistent metadata index (path, size, mtime, inode) of one directory tree.
+
+    `refresh()` brings the index up to date by stat-ing every directory and
+    re-listing only those whose mtime changed; unchanged directories keep their
+    indexed files without a single file stat. A directory's mtime changes when
+    entries are added, removed or renamed in it, but not when an existing file
+    is rewritten in place, so such edits are only picked up by `refresh(full=True)`.
+
+    Each refresh has a sequence number and every added or changed file is
+    stamped with it, so callers can ask for files changed since a sequence and
+    for files older than a cutoff, without walking the tree.
+    """
+
+    def __init__(self, root, index_dir="dir_index"):
+        self.root = os.path.realpath(root)
+        os.makedirs(index_dir, exist_ok=True)
+        self.path = index_path(index_dir, self.root)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.execute("INSERT OR IGNORE INTO meta VALUES ('root', ?)", (self.root,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _meta(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    @property
+    def seq(self):
+        """Sequence number of the last refresh (0 before the first one)."""
+        with self._lock:
+            return int(self._meta("seq", 0))
+
+    def refresh(self, full=False):
+        """Update the index from disk; return counts of what was scanned and changed."""
+        started = time.monotonic()
+        stats = {"dirs": 0, "rescanned": 0, "skipped": 0, "changed": 0, "removed": 0}
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                seq = int(self._meta("seq", 0)) + 1
+                known = dict(conn.execute("SELECT path, mtime_ns FROM dirs"))
+                children = {}
+                for parent, path in conn.execute("SELECT parent, path FROM dirs"):
+                    children.setdefault(parent, []).append(path)
+
+                seen = set()
+                stack = [self.root]
+                while stack:
+                    directory = stack.pop()
+                    try:
+                        st = os.stat(directory, follow_symlinks=False)
+                    except (FileNotFoundError, NotADirectoryError):
+                        continue
+                    seen.add(directory)
+                    stats["dirs"] += 1
+                    if not full and known.get(directory) == st.st_mtime_ns:
+                        stats["skipped"] += 1
+                        stack.extend(children.get(directory, ()))
+                        continue
+                    stats["rescanned"] += 1
+                    stack.extend(self._rescan(directory, st.st_mtime_ns, seq, stats))
+
+                for directory in set(known) - seen:
+                    stats["removed"] += conn.execute("DELETE FROM files WHERE dir = ?", (directory,)).rowcount
+                    conn.execute("DELETE FROM dirs WHERE path = ?", (directory,))
+
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('seq', ?)", (str(seq),))
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('refreshed_at', ?)", (str(time.time()),))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        stats["seq"] = seq
+        stats["duration"] = round(time.monotonic() - started, 3)
+        return stats
+
+    def _rescan(self, directory, mtime_ns, seq, stats):
+        """List one directory, update its file rows and return its subdirectories."""
+        conn = self._conn
+        existing = {
+            name: (size, mtime, inode)
+            for name, size, mtime, inode in conn.execute(
+                "SELECT name, size, mtime_ns, inode FROM files WHERE dir = ?", (directory,)
+            )
+        }
+        subdirs = []
+        upserts = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                            continue
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                    row = (st.st_size, st.st_mtime_ns, st.st_ino)
+                    if existing.pop(entry.name, None) != row:
+                        ext = os.path.splitext(entry.name)[1].lower()
+                        upserts.append((entry.path, directory, entry.name, ext, *row, seq))
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            pass
+        if upserts:
+            conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)", upserts)
+            stats["changed"] += len(upserts)
+        if existing:
+            conn.executemany("DELETE FROM files WHERE path = ?", [(os.path.join(directory, name),) for name in existing])
+            stats["removed"] += len(existing)
+        parent = os.path.dirname(directory) if directory != self.root else None
+        conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", (directory, parent, mtime_ns))
+        return subdirs
+
+    @staticmethod
+    def _ext_filter(extensions):
+        if not extensions:
+            return "", []
+        extensions = sorted({e.lower() if e.startswith(".") else f".{e.lower()}" for e in extensions})
+        return f" AND ext IN ({','.join('?' * len(extensions))})", extensions
+
+    def changed_since(self, seq, extensions=None):
+        """Return `(path, size, mtime_ns)` for files added or changed after refresh `seq`."""
+        clause, params = self._ext_filter(extensions)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT path, size, mtime_ns FROM files WHERE seq > ?{clause} ORDER BY path", [seq, *params]
+            ).fetchall()
+
+    def older_than(self, cutoff, extensions=None):
+        """Return `(path, size, mtime_ns)` for files last modified before the `cutoff` timestamp."""
+        clause, params = self._ext_filter(extensions)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT path, size, mtime_ns FROM files WHERE mtime_ns < ?{clause} ORDER BY path",
+                [int(cutoff * 1e9), *params],
+            ).fetchall()
+
+    def files_in(self, directory, recursive=False, skip_dirs=()):
+        """Return the indexed file paths of `directory` (and below it when `recursive`)."""
+        directory = os.path.realpath(directory)
+        with self._lock:
+            if not recursive:
+                return [row[0] for row in self._conn.execute("SELECT path FROM files WHERE dir = ?", (directory,))]
+            prefix = directory.rstrip(os.sep) + os.sep
+            rows = self._conn.execute(
+                "SELECT path, dir FROM files WHERE dir = ? OR substr(dir, 1, ?) = ?", (directory, len(prefix), prefix)
+            ).fetchall()
+        skip = tuple(os.path.realpath(d) + os.sep for d in skip_dirs)
+        if not skip:
+            return [path for path, _ in rows]
+        return [path for path, parent in rows if not (parent + os.sep).startswith(skip)]
+
+    def stats(self):
+        with self._lock:
+            files, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files").fetchone()
+            dirs = self._conn.execute("SELECT COUNT(*) FROM dirs").fetchone()[0]
+            return {
+                "root": self.root,
+                "index": self.path,
+                "files": files,
+                "bytes": size,
+                "dirs": dirs,
+                "seq": int(self._meta("seq", 0)),
+                "refreshed_at": float(self._meta("refreshed_at", 0)) or None,
+            }
@@ -0,0 +1,149 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+QUERIES = ("ohlc", "rolling", "pct-change", "summary")
+
+
+def _parse_window(window):
+    """Return `window` as a row count if it is all digits, else as a pandas offset string."""
+    if window is None:
+        return None
+    window = str(window).strip()
+    if window.isdigit():
+        return int(window)
+    pd.tseries.frequencies.to_offset(window)  # raises ValueError for an unknown offset
+    return window
+
+
+def _records(frame):
+    """Convert a timestamp-indexed frame to JSON-ready rows (NaN -> None)."""
+    frame = frame.reset_index()
+    rows = {"timestamp": frame["timestamp"].dt.strftime("%Y-%m-%dT%H:%M:%S").tolist()}
+    for column in frame.columns[1:]:
+        values = frame[column].to_numpy(dtype="float64")
+        rows[column] = np.where(np.isnan(values), None, np.round(values, 4)).tolist()
+    return [dict(zip(rows, values)) for values in zip(*rows.values())]
+
+
+class GoldRateAnalytics:
+    """Typed, cached view of a `PriceHistory` with vectorized OHLC / rolling / change queries.
+
+    The history is parsed once into a timestamp-indexed float64 series. Later
+    calls stat the CSV and parse only the bytes appended since the last load;
+    a file that shrank or was replaced is reloaded from scratch. Query results
+    are memoized until the next append.
+    """
+
+    def __init__(self, history, max_cached=64):
+        self.history = history
+        self.max_cached = max_cached
+        self._lock = threading.Lock()
+        self._series = pd.Series(dtype="float64", index=pd.DatetimeIndex([], name="timestamp"), name="price")
+        self._offset = 0
+        self._signature = None
+        self._results = {}
+        self.counters = {"loads": 0, "incremental_loads": 0, "hits": 0, "misses": 0}
+
+    def _refresh(self):
+        """Bring the cached series up to date with the file; caller holds the lock."""
+        try:
+            st = os.stat(self.history.path)
+        except FileNotFoundError:
+            st = None
+        signature = (st.st_ino, st.st_size, st.st_mtime_ns) if st else None
+        if signature == self._signature:
+            return
+        if st is None or self._signature is None or st.st_ino != self._signature[0] or st.st_size < self._offset:
+            frame, self._offset = self.history.read_from(0)
+            self._series = self._to_series(frame)
+            self.counters["loads"] += 1
+        else:
+            frame, self._offset = self.history.read_from(self._offset)
+            if len(frame):
+                self._series = pd.concat([self._series, self._to_series(frame)])
+                if not self._series.index.is_monotonic_increasing:
+                    self._series = self._series.sort_index(kind="stable")
+            self.counters["incremental_loads"] += 1
+        self._signature = signature
+        self._results.clear()
+
+    @staticmethod
+    def _to_series(frame):
+        series = pd.Series(
+            frame["price"].to_numpy(dtype="float64"),
+            index=pd.DatetimeIndex(frame["timestamp"], name="timestamp"),
+            name="price",
+        )
+        series = series[~np.isnan(series.to_numpy())]
+        return series if series.index.is_monotonic_increasing else series.sort_index(kind="stable")
+
+    def series(self):
+        """Return the price series (timestamp index, float64 values), reloading only what changed."""
+        with self._lock:
+            self._refresh()
+            return self._series
+
+    def query(self, name, window=None, periods=1, start=None, end=None):
+        """Run one of QUERIES over [start, end] and return JSON-ready rows (memoized per history version)."""
+        if name not in QUERIES:
+            raise ValueError(f"Unknown query '{name}', expected one of: {', '.join(QUERIES)}")
+        window = _parse_window(window)
+        periods = int(periods)
+        start = pd.Timestamp(start) if start else None
+        end = pd.Timestamp(end) if end else None
+        key = (name, window, periods, start, end)
+        with self._lock:
+            self._refresh()
+            cached = self._results.get(key)
+            if cached is not None:
+                self.counters["hits"] += 1
+                return cached
+            self.counters["misses"] += 1
+            series = self._series.loc[start:end]
+        result = getattr(self, f"_{name.replace('-', '_')}")(series, window, periods)
+        with self._lock:
+            if len(self._results) >= self.max_cached:
+                self._results.pop(next(iter(self._results)))
+            self._results[key] = result
+        return result
+
+    def _ohlc(self, series, window, periods):
+        if isinstance(window, int):
+            raise ValueError("OHLC needs a time window such as '1D' or '1W'")
+        frame = series.resample(window or "1D").ohlc().dropna(how="all")
+        return _records(frame)
+
+    def _rolling(self, series, window, periods):
+        frame = series.rolling(window or "7D", min_periods=1).mean().rename("mean").to_frame()
+        frame["price"] = series
+        return _records(frame[["price", "mean"]])
+
+    def _pct_change(self, series, window, periods):
+        if isinstance(window, int):
+            raise ValueError("Percent change takes a time window to resample to; use --periods for a row count")
+        if window:
+            series = series.resample(window).last().dropna()
+        values = series.to_numpy()
+        change = np.full(len(values), np.nan)
+        if 0 < periods < len(values):
+            change[periods:] = (values[periods:] / values[:-periods] - 1.0) * 100
+        frame = pd.DataFrame({"price": values, "pct_change": change}, index=series.index)
+        return _records(frame)
+
+    def _summary(self, series, window, periods):
+        values = series.to_numpy()
+        if not len(values):
+            return {"count": 0}
+        return {
+            "count": int(len(values)),
+            "first": series.index[0].strftime("%Y-%m-%dT%H:%M:%S"),
+            "last": series.index[-1].strftime("%Y-%m-%dT%H:%M:%S"),
+            "latest": float(values[-1]),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "mean": round(float(values.mean()), 4),
+            "change_pct": round(float((values[-1] / values[0] - 1.0) * 100), 4),
+        }
@@ -0,0 +1,158 @@
+import csv
+import io
+import os
+import re
+import threading
+
+from lxml import etree
+
+GOLD_RATE_URL = "https://www.bankbazaar.com/gold-rate-tamil-nadu.html"
+
+# First <span class="... white-space-nowrap ...">, compiled once.
+_PRICE_XPATH = etree.XPath(
+    "(//span[contains(concat(' ', normalize-space(@class), ' '), ' white-space-nowrap ')])[1]"
+)
+
+
+def extract_gold_price(body):
+    """Return the text of the page's price span, or None if it is missing.
+
+    Uses lxml's C HTML parser with a precompiled XPath instead of building a
+    full BeautifulSoup tree; `body` is the decoded page text.
+    """
+    if not body:
+        return None
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+        parser = etree.HTMLParser(encoding="utf-8", remove_comments=True, no_network=True)
+    else:
+        parser = etree.HTMLParser(remove_comments=True, no_network=True)
+    root = etree.fromstring(body, parser)
+    if root is None:
+        return None
+    spans = _PRICE_XPATH(root)
+    if not spans:
+        return None
+    # Same as BeautifulSoup's get_text(strip=True).
+    text = "".join(part.strip() for part in spans[0].itertext())
+    return text or None
+
+
+HISTORY_COLUMNS = ("timestamp", "price_text", "price")
+_PRICE_NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?")
+
+
+def parse_price(text):
+    """Return the first number in a scraped price ("₹6,575.50/g" -> 6575.5), or None."""
+    match = _PRICE_NUMBER.search(text or "")
+    if not match:
+        return None
+    return float(match.group(0).replace(",", ""))
+
+
+class PriceHistory:
+    """Append-only CSV time series of scraped gold prices.
+
+    Each sample is one line written with a single O_APPEND write, so adding a
+    sample costs the same however long the history is, and a crash can at
+    worst leave a truncated last line, which readers ignore and the next append
+    removes. The price is parsed to a number at write time; the scraped text is
+    kept alongside it.
+    """
+
+    def __init__(self, path="gold_rates.csv"):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, timestamp, price_text):
+        price = parse_price(price_text)
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow(
+            [timestamp, price_text, "" if price is None else repr(price)]
+        )
+        line = buffer.getvalue().encode("utf-8")
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                size = self._drop_partial_line(fd, os.fstat(fd).st_size)
+                if size == 0:
+                    line = (",".join(HISTORY_COLUMNS) + "\n").encode("utf-8") + line
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        return price
+
+    @staticmethod
+    def _drop_partial_line(fd, size):
+        """Cut off a last line left unterminated by a crash; return the new size."""
+        if size == 0 or os.pread(fd, 1, size - 1) == b"\n":
+            return size
+        tail_size = min(size, 64 * 1024)
+        tail = os.pread(fd, tail_size, size - tail_size)
+        cut = tail.rfind(b"\n")
+        if cut < 0 and tail_size < size:
+            os.write(fd, b"\n")  # implausibly long line: leave it, just terminate it
+            return size + 1
+        size = size - tail_size + cut + 1
+        os.ftruncate(fd, size)
+        return size
+
+    def read(self):
+        """Load the history as a DataFrame (timestamp parsed, price numeric)."""
+        return self.read_from(0)[0]
+
+    def read_from(self, offset):
+        """Load the samples stored from byte `offset` on; return `(frame, next_offset)`.
+
+        `offset` must be 0 or an offset previously returned, so callers can pick
+        up only the samples appended since their last read.
+        """
+        import pandas as pd
+
+        empty = pd.DataFrame({
+            "timestamp": pd.Series(dtype="datetime64[ns]"),
+            "price_text": pd.Series(dtype=object),
+            "price": pd.Series(dtype="float64"),
+        })
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return empty, 0
+        # Ignore a last line that is still being written (or was cut short by a crash).
+        data = data[:data.rfind(b"\n") + 1]
+        next_offset = offset + len(data)
+        if not data:
+            return empty, next_offset
+        df = pd.read_csv(
+            io.BytesIO(data),
+            header=0 if offset == 0 else None,
+            names=None if offset == 0 else list(HISTORY_COLUMNS),
+            dtype={"price_text": str},
+            keep_default_na=False,
+            on_bad_lines="skip",
+        )
+        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+        df["price"] = pd.to_numeric(df["price"], errors="coerce")
+        return df.dropna(subset=["timestamp"]), next_offset
+
+    def import_excel(self, excel_file):
+        """Seed an empty history from the legacy `gold_rates.xlsx` workbook; return rows imported."""
+        import pandas as pd
+
+        if os.path.exists(self.path) or not os.path.exists(excel_file):
+            return 0
+        legacy = pd.read_excel(excel_file)
+        for timestamp, price_text in zip(legacy["Timestamp"], legacy["22k India Gold Price"]):
+            self.append(str(timestamp), str(price_text))
+        return len(legacy)
+
+    def export_excel(self, excel_file):
+        """Write the full history to an Excel workbook (atomically replaced); return the row count."""
+        df = self.read()
+        out = df.rename(columns={"timestamp": "Timestamp", "price_text": "22k India Gold Price", "price": "Price (INR)"})
+        tmp_path = os.path.join(os.path.dirname(excel_file) or ".", f".{os.path.basename(excel_file)}.tmp.xlsx")
+        out.to_excel(tmp_path, index=False)
+        os.replace(tmp_path, excel_file)
+        return len(out)
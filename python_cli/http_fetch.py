@@ -0,0 +1,91 @@
+import hashlib
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+class FetchResult:
+    """Outcome of a conditional GET.
+
+    `changed` is False when the server answered 304 or the body hashed the same
+    as last time; `value` then holds what `extract` returned for the last
+    changed body, so callers can skip parsing entirely.
+    """
+
+    __slots__ = ("url", "status", "changed", "value", "body")
+
+    def __init__(self, url, status, changed, value, body=None):
+        self.url = url
+        self.status = status
+        self.changed = changed
+        self.value = value
+        self.body = body
+
+
+class HttpFetcher:
+    """Shared keep-alive session with ETag / Last-Modified revalidation per URL."""
+
+    def __init__(self, headers=None, timeout=10, pool_size=10):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._validators = {}  # url -> {"etag", "last_modified", "hash", "value"}
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "not_modified": 0, "unchanged": 0, "parsed": 0}
+
+    def fetch(self, url, extract=None):
+        """GET `url` conditionally and run `extract(text)` only if the content changed.
+
+        Raises requests exceptions for transport errors and HTTP error statuses.
+        """
+        with self._lock:
+            cached = dict(self._validators.get(url) or {})
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        self.counters["requests"] += 1
+        if response.status_code == 304 and "hash" in cached:
+            self.counters["not_modified"] += 1
+            return FetchResult(url, 304, False, cached.get("value"))
+        response.raise_for_status()
+
+        body = response.content
+        digest = hashlib.sha1(body).hexdigest()
+        entry = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "hash": digest,
+        }
+        if digest == cached.get("hash"):
+            self.counters["unchanged"] += 1
+            entry["value"] = cached.get("value")
+            changed = False
+        else:
+            entry["value"] = extract(response.text) if extract else None
+            self.counters["parsed"] += 1
+            changed = True
+        with self._lock:
+            self._validators[url] = entry
+        return FetchResult(url, response.status_code, changed, entry["value"], body)
+
+    def forget(self, url):
+        """Drop the validators of `url` so the next fetch is unconditional."""
+        with self._lock:
+            self._validators.pop(url, None)
+
+    def close(self):
+        self.session.close()
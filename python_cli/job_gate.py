@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+def resource_key(path):
+    """Normalize a directory path into a resource key."""
+    return os.path.realpath(os.path.expanduser(path))
+
+
+def _overlaps(a, b):
+    """True if two path keys are the same or one contains the other."""
+    return a == b or a.startswith(b.rstrip(os.sep) + os.sep) or b.startswith(a.rstrip(os.sep) + os.sep)
+
+
+class _Ticket:
+    __slots__ = ("job_id", "resources", "queued_at")
+
+    def __init__(self, job_id, resources):
+        self.job_id = job_id
+        self.resources = resources
+        self.queued_at = time.monotonic()
+
+
+class JobGate:
+    """Admission control for job runs: a global concurrency limit plus per-resource exclusion.
+
+    A run waits in a queue until fewer than `max_concurrent` runs are active
+    (0 = no limit) and none of them holds an overlapping resource key. Keys are
+    directory paths, so a run on /data conflicts with one on /data/photos.
+    Waiting runs are admitted in arrival order, except that a run whose
+    resources are busy does not hold up later runs that could start.
+
+    The time each run spent queued is recorded per job id.
+    """
+
+    def __init__(self, max_concurrent=0):
+        self.max_concurrent = max_concurrent
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._held = []  # resource keys of running jobs (one entry per holder)
+        self._running = 0
+        self._stats = {}
+
+    def _busy(self, resources):
+        return any(_overlaps(r, h) for r in resources for h in self._held)
+
+    def _admissible(self, ticket):
+        if self._busy(ticket.resources):
+            return False
+        ahead = 0
+        for other in self._waiting:
+            if other is ticket:
+                break
+            if self._busy(other.resources):
+                continue
+            # An earlier runnable waiter goes first.
+            if any(_overlaps(r, o) for r in ticket.resources for o in other.resources):
+                return False
+            ahead += 1
+        return not self.max_concurrent or self._running + ahead < self.max_concurrent
+
+    @contextmanager
+    def hold(self, job_id, resources=()):
+        """Block until `job_id` may run with `resources`; yield the seconds it waited."""
+        ticket = _Ticket(job_id, tuple(resources))
+        with self._cond:
+            self._waiting.append(ticket)
+            try:
+                while not self._admissible(ticket):
+                    self._cond.wait()
+            finally:
+                self._waiting.remove(ticket)
+            self._running += 1
+            self._held.extend(ticket.resources)
+            wait = time.monotonic() - ticket.queued_at
+            self._record(job_id, wait)
+        try:
+            yield wait
+        finally:
+            with self._cond:
+                self._running -= 1
+                for resource in ticket.resources:
+                    self._held.remove(resource)
+                self._cond.notify_all()
+
+    def _record(self, job_id, wait):
+        stats = self._stats.setdefault(job_id, {"runs": 0, "wait_total": 0.0, "wait_max": 0.0, "wait_last": 0.0})
+        stats["runs"] += 1
+        stats["wait_total"] += wait
+        stats["wait_last"] = wait
+        stats["wait_max"] = max(stats["wait_max"], wait)
+
+    def stats(self):
+        """Return `{running, queued, jobs: {job_id: runs/queued and wait last/avg/max}}`."""
+        with self._cond:
+            queued = {}
+            for ticket in self._waiting:
+                queued[ticket.job_id] = queued.get(ticket.job_id, 0) + 1
+            jobs = {}
+            for job_id, stats in self._stats.items():
+                jobs[job_id] = {
+                    "runs": stats["runs"],
+                    "queued": queued.pop(job_id, 0),
+                    "wait_last": round(stats["wait_last"], 3),
+                    "wait_avg": round(stats["wait_total"] / stats["runs"], 3),
+                    "wait_max": round(stats["wait_max"], 3),
+                }
+            for job_id, count in queued.items():
+                jobs[job_id] = {"runs": 0, "queued": count, "wait_last": None, "wait_avg": None, "wait_max": None}
+            return {"running": self._running, "queued": len(self._waiting), "jobs": jobs}
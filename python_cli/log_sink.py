@@ -0,0 +1,187 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+BLOCK = "block"
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+POLICIES = (BLOCK, DROP_NEWEST, DROP_OLDEST)
+
+_STOP = object()
+
+
+class _FlushRequest:
+    """Marker placed on the queue to ask the writer thread for a flush."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class MongoLogSink:
+    """Buffer log entries and write them to MongoDB in batches from a background thread.
+
+    Entries are flushed with `insert_many` once `batch_size` entries are waiting
+    or `flush_interval` seconds have passed, whichever comes first. When the
+    queue holds `max_queue` entries, `policy` decides what happens:
+
+    - "block": the caller waits up to `block_timeout` seconds for room, then the entry is dropped.
+    - "drop_newest": the new entry is dropped.
+    - "drop_oldest": the oldest queued entry is dropped to make room.
+    """
+
+    def __init__(self, collection, batch_size=500, flush_interval=1.0, max_queue=10000,
+                 policy=BLOCK, block_timeout=5.0, logger=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unsupported log sink policy '{policy}'. Expected one of {POLICIES}")
+        self.collection = collection
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._queue = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._thread = None
+        self._closed = False
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._flushed = 0
+        self._dropped = 0
+        self._failed = 0
+        self._batches = 0
+
+    def start(self):
+        """Start the writer thread if it is not running yet."""
+        with self._start_lock:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(target=self._run, name="mongo-log-sink", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def put(self, entry):
+        """Queue a log entry. Returns False if the entry was dropped."""
+        if self._closed:
+            # The writer is gone (e.g. after scheduler shutdown); fall back to a direct write.
+            return self._write([entry])
+        self.start()
+
+        if self.policy == BLOCK:
+            try:
+                self._queue.put(entry, timeout=self.block_timeout)
+            except queue.Full:
+                return self._drop()
+        elif self.policy == DROP_NEWEST:
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                return self._drop()
+        else:
+            while True:
+                try:
+                    self._queue.put_nowait(entry)
+                    break
+                except queue.Full:
+                    try:
+                        oldest = self._queue.get_nowait()
+                    except queue.Empty:
+                        continue
+                    if isinstance(oldest, _FlushRequest) or oldest is _STOP:
+                        # Control markers are never dropped; put it back and give up on this entry.
+                        self._queue.put(oldest)
+                        return self._drop()
+                    self._drop()
+
+        with self._stats_lock:
+            self._queued += 1
+        return True
+
+    def flush(self, timeout=None):
+        """Block until every entry queued before this call has been written."""
+        if self._thread is None or self._closed:
+            return True
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def close(self, timeout=10.0):
+        """Flush pending entries and stop the writer thread."""
+        with self._start_lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+        stats = self.stats()
+        self.logger.info(
+            f"Mongo log sink closed: {stats['queued']} queued, {stats['flushed']} flushed, "
+            f"{stats['dropped']} dropped, {stats['failed']} failed"
+        )
+
+    def stats(self):
+        """Return counters describing the sink's activity."""
+        with self._stats_lock:
+            return {
+                "queued": self._queued,
+                "flushed": self._flushed,
+                "dropped": self._dropped,
+                "failed": self._failed,
+                "batches": self._batches,
+                "pending": self._queue.qsize(),
+                "policy": self.policy,
+            }
+
+    def _drop(self):
+        with self._stats_lock:
+            self._dropped += 1
+        return False
+
+    def _write(self, batch):
+        try:
+            if len(batch) == 1:
+                self.collection.insert_one(batch[0])
+            else:
+                self.collection.insert_many(batch, ordered=False)
+        except Exception as e:
+            self.logger.error(f"Failed to write {len(batch)} log entries to MongoDB: {e}")
+            with self._stats_lock:
+                self._failed += len(batch)
+            return False
+        with self._stats_lock:
+            self._flushed += len(batch)
+            self._batches += 1
+        return True
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is None or item is _STOP or isinstance(item, _FlushRequest):
+                if batch:
+                    self._write(batch)
+                    batch = []
+                deadline = None
+                if isinstance(item, _FlushRequest):
+                    item.done.set()
+                elif item is _STOP:
+                    return
+                continue
+
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+                deadline = None
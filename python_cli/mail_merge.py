@@ -0,0 +1,133 @@
+import logging
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+TRANSIENT_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def is_transient_error(error):
+    """Return True for SMTP failures worth retrying (connection drops, 4xx replies)."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return bool(codes) and all(400 <= code < 500 for code in codes)
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+class RateLimiter:
+    """Token bucket limiting sends to `rate` per second across all workers."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate) if rate else 0.0
+        self.capacity = float(burst or max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class MailMerge:
+    """Render and send one message per recipient through a bounded worker pool.
+
+    `deliver(email, body)` must send a single rendered message and raise on
+    failure. Transient failures are retried with exponential backoff; the run
+    returns a report with sent/failed/invalid counts and the first
+    `max_failures` failed or invalid results, so its size does not grow with
+    the recipient list. Pass `on_result` to see every per-recipient result.
+    """
+
+    def __init__(self, deliver, template, workers=4, rate=None, max_retries=3,
+                 backoff=1.0, max_backoff=30.0, validate=None, logger=None,
+                 max_failures=100, on_result=None):
+        self.deliver = deliver
+        self.template = template
+        self.workers = max(1, int(workers))
+        self.rate_limiter = RateLimiter(rate)
+        self.max_retries = max(0, int(max_retries))
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.validate = validate
+        self.logger = logger or logging.getLogger(__name__)
+        self.max_failures = max(0, int(max_failures))
+        self.on_result = on_result
+
+    def render(self, name):
+        """Fill the per-recipient placeholders of the message template."""
+        return self.template.replace("{name}", name if isinstance(name, str) else "")
+
+    def run(self, recipients):
+        """Send to every `(email, name)` pair and return the result report.
+
+        Items may also be `(email, name, valid)` when the recipients were already
+        validated (e.g. vectorized over a whole chunk); `validate` is then skipped.
+        """
+        report = {"sent": 0, "failed": 0, "invalid": 0, "failures": []}
+        lock = threading.Lock()
+        # Bound the number of queued sends so huge recipient lists are not materialized as futures.
+        in_flight = threading.BoundedSemaphore(self.workers * 2)
+
+        def record(result):
+            with lock:
+                report[result["status"]] += 1
+                if result["status"] != "sent" and len(report["failures"]) < self.max_failures:
+                    report["failures"].append(result)
+                if self.on_result is not None:
+                    self.on_result(result)
+
+        def work(email, name):
+            try:
+                record(self._send_with_retry(email, name))
+            finally:
+                in_flight.release()
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="mail-merge") as pool:
+            for email, name, *checked in recipients:
+                valid = checked[0] if checked else (self.validate is None or self.validate(email))
+                if not valid:
+                    self.logger.warning(f"Invalid email: {email}")
+                    record({"email": email, "status": "invalid", "attempts": 0, "error": "invalid address"})
+                    continue
+                in_flight.acquire()
+                pool.submit(work, email, name)
+        report["duration"] = round(time.monotonic() - started, 3)
+        return report
+
+    def _send_with_retry(self, email, name):
+        body = self.render(name)
+        attempt = 0
+        while True:
+            attempt += 1
+            self.rate_limiter.acquire()
+            try:
+                self.deliver(email, body)
+                self.logger.info(f"Email sent to {email}")
+                return {"email": email, "status": "sent", "attempts": attempt, "error": None}
+            except Exception as e:
+                if attempt > self.max_retries or not is_transient_error(e):
+                    self.logger.error(f"Failed to send email to {email}: {e}")
+                    return {"email": email, "status": "failed", "attempts": attempt, "error": str(e)}
+                delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+                self.logger.warning(f"Transient error sending to {email} (attempt {attempt}): {e}; retrying in {delay:.1f}s")
+                time.sleep(delay)
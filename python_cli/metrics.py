@@ -0,0 +1,192 @@
+import bisect
+import math
+import threading
+import time
+
+# Upper bounds (seconds) of the duration / lag histogram buckets.
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+PREFIX = "autopygo_"
+
+HELP = {
+    "job_runs_total": ("counter", "Job runs by outcome (success, partial, error)."),
+    "job_skipped_total": ("counter", "Job runs skipped and coalesced (missed or overlapped)."),
+    "job_items_total": ("counter", "Task-specific work done by job runs (files moved, emails sent, bytes compressed, ...)."),
+    "job_duration_seconds": ("histogram", "Wall time of job runs."),
+    "job_schedule_lag_seconds": ("histogram", "Delay between a run's scheduled time and its start."),
+    "job_queue_wait_seconds": ("histogram", "Time runs spent waiting in the job queue."),
+    "job_last_run_timestamp_seconds": ("gauge", "Unix time the last run of a job finished."),
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense, plus the max seen."""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "max")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "avg": round(self.sum / self.count, 4),
+            "p50": round(self.quantile(0.5), 4),
+            "p95": round(self.quantile(0.95), 4),
+            "max": round(self.max, 4),
+        }
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """In-process registry of job counters, gauges and histograms.
+
+    Series are keyed by metric name and a sorted tuple of label pairs. The
+    registry renders the Prometheus text exposition format and a JSON summary
+    per task.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._last_runs = {}
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def record_run(self, task, task_type, trigger, outcome, duration, lag=None, wait=None, items=None):
+        """Record one finished job run."""
+        labels = {"task": task, "task_type": task_type}
+        self.inc("job_runs_total", outcome=outcome, trigger=trigger, **labels)
+        self.observe("job_duration_seconds", duration, **labels)
+        if lag is not None:
+            self.observe("job_schedule_lag_seconds", max(lag, 0.0), **labels)
+        if wait is not None:
+            self.observe("job_queue_wait_seconds", wait, **labels)
+        for item, value in (items or {}).items():
+            if value:
+                self.inc("job_items_total", value, item=item, **labels)
+        finished = time.time()
+        self.set("job_last_run_timestamp_seconds", finished, **labels)
+        with self._lock:
+            self._last_runs[task] = {
+                "finished": round(finished, 3),
+                "trigger": trigger,
+                "outcome": outcome,
+                "duration": round(duration, 4),
+                "schedule_lag": None if lag is None else round(lag, 4),
+                "queue_wait": None if wait is None else round(wait, 4),
+                "items": {k: v for k, v in (items or {}).items() if v},
+            }
+
+    def render_prometheus(self):
+        """Return all series in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted(
+                (key, (list(h.counts), h.sum, h.count)) for key, h in self._histograms.items()
+            )
+        lines = []
+        announced = set()
+
+        def announce(name):
+            if name not in announced:
+                announced.add(name)
+                kind, text = HELP.get(name, ("untyped", name))
+                lines.append(f"# HELP {PREFIX}{name} {text}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        for (name, labels), value in counters + gauges:
+            announce(name)
+            lines.append(f"{PREFIX}{name}{_format_labels(labels)} {_format_value(value)}")
+        for (name, labels), (counts, total, count) in histograms:
+            announce(name)
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                bucket_labels = labels + (("le", _format_value(float(bound)) if bound != math.inf else "+Inf"),)
+                lines.append(f"{PREFIX}{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{PREFIX}{name}_sum{_format_labels(labels)} {_format_value(float(total))}")
+            lines.append(f"{PREFIX}{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """Return `{task: {task_type, runs, skipped, items, duration, schedule_lag, queue_wait, last_run}}`."""
+        tasks = {}
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                labels = dict(labels)
+                task = tasks.setdefault(labels["task"], {"runs": {}, "skipped": {}, "items": {}})
+                if "task_type" in labels:
+                    task["task_type"] = labels["task_type"]
+                if name == "job_runs_total":
+                    task["runs"][labels["outcome"]] = task["runs"].get(labels["outcome"], 0) + value
+                elif name == "job_skipped_total":
+                    task["skipped"][labels["reason"]] = value
+                elif name == "job_items_total":
+                    task["items"][labels["item"]] = value
+            for (name, labels), histogram in self._histograms.items():
+                task = tasks.setdefault(dict(labels)["task"], {"runs": {}, "skipped": {}, "items": {}})
+                task[name[len("job_"):-len("_seconds")]] = histogram.summary()
+            for name, last_run in self._last_runs.items():
+                tasks.setdefault(name, {"runs": {}, "skipped": {}, "items": {}})["last_run"] = dict(last_run)
+        return tasks
@@ -0,0 +1,175 @@
+import errno
+import json
+import os
+import shutil
+import time
+
+DEFAULT_CATEGORY = "Others"
+
+
+def build_extension_map(file_types):
+    """Invert `{category: [extensions]}` into `{".ext": category}`; the first category listing an extension wins."""
+    extension_map = {}
+    for category, extensions in file_types.items():
+        for extension in extensions:
+            extension = str(extension).strip().lower()
+            if not extension.startswith("."):
+                extension = f".{extension}"
+            extension_map.setdefault(extension, category)
+    return extension_map
+
+
+def load_category_map(path):
+    """Read a `{category: [extensions]}` JSON file."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not all(isinstance(v, list) for v in data.values()):
+        raise ValueError(f"Category map '{path}' must map folder names to lists of extensions")
+    return data
+
+
+def _unique_name(name, taken):
+    """Return `name`, or `stem (n)ext` for the first n not in `taken`."""
+    if name not in taken:
+        return name
+    stem, extension = os.path.splitext(name)
+    n = 1
+    while f"{stem} ({n}){extension}" in taken:
+        n += 1
+    return f"{stem} ({n}){extension}"
+
+
+def _move(entry, category_dir, taken):
+    """Move one file into `category_dir` without overwriting; return the name it got."""
+    name = _unique_name(entry.name, taken)
+    while True:
+        target = os.path.join(category_dir, name)
+        try:
+            # os.rename silently replaces an existing file on POSIX, so check first.
+            if os.path.lexists(target):
+                raise FileExistsError(errno.EEXIST, "File exists", target)
+            os.rename(entry.path, target)
+        except FileExistsError:
+            # Created since the category folder was listed.
+            taken.add(name)
+            name = _unique_name(entry.name, taken)
+            continue
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(entry.path, target)
+        taken.add(name)
+        return name
+
+
+def _iter_files(directory, recursive, skip_dirs):
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and entry.path not in skip_dirs:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
+class _PathEntry:
+    """Minimal stand-in for os.DirEntry when organizing explicit paths."""
+
+    __slots__ = ("path", "name")
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+
+
+def _category_dirs(directory, extension_map, default_category):
+    categories = set(extension_map.values()) | {default_category}
+    return {category: os.path.join(directory, category) for category in categories}
+
+
+def category_folders(directory, extension_map, default_category=DEFAULT_CATEGORY):
+    """Return the category folder paths organize_directory would use under `directory`."""
+    return set(_category_dirs(os.path.abspath(directory), extension_map, default_category).values())
+
+
+def _move_grouped(directory, by_category, category_dirs, started):
+    summary = {"directory": directory, "moved": 0, "renamed": 0, "failed": 0, "categories": {}, "errors": []}
+    for category, entries in by_category.items():
+        category_dir = category_dirs[category]
+        os.makedirs(category_dir, exist_ok=True)
+        with os.scandir(category_dir) as existing:
+            taken = {entry.name for entry in existing}
+
+        moved = 0
+        for entry in entries:
+            try:
+                name = _move(entry, category_dir, taken)
+            except FileNotFoundError:
+                continue  # moved away meanwhile (e.g. by a watcher batch and a reconcile run)
+            except OSError as e:
+                summary["failed"] += 1
+                if len(summary["errors"]) < 100:
+                    summary["errors"].append({"file": entry.path, "error": str(e)})
+                continue
+            moved += 1
+            if name != entry.name:
+                summary["renamed"] += 1
+        summary["moved"] += moved
+        summary["categories"][category] = moved
+
+    summary["duration"] = round(time.monotonic() - started, 3)
+    return summary
+
+
+def organize_directory(directory, extension_map, recursive=False, default_category=DEFAULT_CATEGORY):
+    """Move every file of `directory` into a `<directory>/<category>` folder.
+
+    One scandir pass collects the files grouped by category, the category
+    folders are created (and their current names listed) once, then each file is
+    moved with `os.rename` under a name that does not clash with an existing
+    file (`report (1).pdf`). Moves across filesystems fall back to shutil.move.
+    With `recursive`, files in subdirectories are gathered too, except those
+    already inside a top-level category folder. Returns a run summary.
+    """
+    started = time.monotonic()
+    directory = os.path.abspath(directory)
+    category_dirs = _category_dirs(directory, extension_map, default_category)
+
+    by_category = {}
+    for entry in _iter_files(directory, recursive, set(category_dirs.values())):
+        category = extension_map.get(os.path.splitext(entry.name)[1].lower(), default_category)
+        by_category.setdefault(category, []).append(entry)
+    return _move_grouped(directory, by_category, category_dirs, started)
+
+
+def organize_paths(directory, paths, extension_map, recursive=False, default_category=DEFAULT_CATEGORY):
+    """Organize only the given files of `directory` (e.g. ones reported by a watcher).
+
+    Paths that are gone, are not regular files, sit outside `directory` (or in
+    a subdirectory when not `recursive`) or already live in a category folder
+    are skipped. Returns a summary in the same shape as organize_directory.
+    """
+    started = time.monotonic()
+    directory = os.path.abspath(directory)
+    category_dirs = _category_dirs(directory, extension_map, default_category)
+    skip_dirs = set(category_dirs.values())
+
+    by_category = {}
+    for path in set(paths):
+        path = os.path.abspath(path)
+        parent = os.path.dirname(path)
+        if recursive:
+            parts = os.path.relpath(path, directory).split(os.sep)
+            if parts[0] == os.pardir or (len(parts) > 1 and os.path.join(directory, parts[0]) in skip_dirs):
+                continue
+        elif parent != directory:
+            continue
+        if os.path.islink(path) or not os.path.isfile(path):
+            continue
+        entry = _PathEntry(path)
+        category = extension_map.get(os.path.splitext(entry.name)[1].lower(), default_category)
+        by_category.setdefault(category, []).append(entry)
+    return _move_grouped(directory, by_category, category_dirs, started)
@@ -0,0 +1,154 @@
+import os
+import tempfile
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_LEVEL = 6
+
+
+def _deflate_chunk(data, level, last):
+    """Raw-deflate one chunk of a member.
+
+    Each chunk gets its own compressor; a sync flush ends it on a byte boundary
+    so the compressed chunks concatenate into one valid deflate stream, and only
+    the member's last chunk carries the final block.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def _iter_chunks(path, chunk_size):
+    """Yield `(data, last)` for a file; an empty file yields one empty last chunk."""
+    with open(path, "rb") as f:
+        data = f.read(chunk_size)
+        while True:
+            following = f.read(chunk_size) if data else b""
+            last = not following
+            yield data, last
+            if last:
+                return
+            data = following
+
+
+class _MemberWriter:
+    """Writes one deflated member straight into an open ZipFile (mode "w")."""
+
+    def __init__(self, zipf, path, arcname, level):
+        self.zipf = zipf
+        self.info = zipfile.ZipInfo.from_file(path, arcname)
+        self.info.compress_type = zipfile.ZIP_DEFLATED
+        self.info.file_size = os.path.getsize(path)
+        self.info.compress_size = 0
+        self.info.CRC = 0
+        self.zip64 = self.info.file_size * 1.05 > zipfile.ZIP64_LIMIT
+        self.info.header_offset = zipf.fp.tell()
+        zipf.fp.write(self.info.FileHeader(self.zip64))
+        self.file_size = 0
+
+    def write(self, raw, compressed):
+        self.info.CRC = zlib.crc32(raw, self.info.CRC)
+        self.file_size += len(raw)
+        self.info.compress_size += len(compressed)
+        self.zipf.fp.write(compressed)
+
+    def close(self):
+        fp = self.zipf.fp
+        self.info.file_size = self.file_size
+        if not self.zip64 and max(self.info.file_size, self.info.compress_size) > zipfile.ZIP64_LIMIT:
+            raise RuntimeError(f"'{self.info.filename}' grew past the zip64 limit while being archived")
+        end = fp.tell()
+        # The local header has the same length either way, so it can be rewritten in place.
+        fp.seek(self.info.header_offset)
+        fp.write(self.info.FileHeader(self.zip64))
+        fp.seek(end)
+        self.zipf.start_dir = end
+        self.zipf.filelist.append(self.info)
+        self.zipf.NameToInfo[self.info.filename] = self.info
+
+
+def write_parallel_zip(output_path, members, workers=4, level=DEFAULT_LEVEL, chunk_size=CHUNK_SIZE, extra_members=None):
+    """Write a deflated zip, compressing members in a thread pool.
+
+    `members` is `{arcname: path}` (or `{arcname: (path, ...)}`). Files are split
+    into `chunk_size` pieces that are compressed concurrently (zlib releases the
+    GIL) and written in archive order, so large single files benefit as well as
+    many small ones. The number of chunks in flight is bounded to keep memory flat.
+    """
+    level = DEFAULT_LEVEL if level is None else int(level)
+    workers = max(1, int(workers))
+    max_in_flight = workers * 4
+    pending = deque()
+
+    with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED, compresslevel=level) as zipf, \
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zip") as pool:
+
+        writer = None
+
+        def drain(limit):
+            nonlocal writer
+            while len(pending) > limit:
+                path, arcname, raw, last, future = pending.popleft()
+                if writer is None:
+                    # The local header goes in once every earlier member has been written.
+                    writer = _MemberWriter(zipf, path, arcname, level)
+                writer.write(raw, future.result())
+                if last:
+                    writer.close()
+                    writer = None
+
+        for arcname, member in sorted(members.items()):
+            path = member[0] if isinstance(member, tuple) else member
+            for data, last in _iter_chunks(path, chunk_size):
+                pending.append((path, arcname, data, last, pool.submit(_deflate_chunk, data, level, last)))
+                drain(max_in_flight)
+        drain(0)
+
+        for arcname, data in (extra_members or {}).items():
+            zipf.writestr(arcname, data)
+
+
+def write_serial_zip(output_path, members, level=None, extra_members=None):
+    """Write a zip one member at a time; stored when `level` is None, deflated otherwise."""
+    if level is None:
+        zipf = zipfile.ZipFile(output_path, "w")
+    else:
+        zipf = zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED, compresslevel=int(level))
+    with zipf:
+        for arcname, member in sorted(members.items()):
+            zipf.write(member[0] if isinstance(member, tuple) else member, arcname)
+        for arcname, data in (extra_members or {}).items():
+            zipf.writestr(arcname, data)
+
+
+def benchmark_zip(directory, workers=None, level=DEFAULT_LEVEL, repeat=1):
+    """Time the serial and parallel zip writers on `directory`; return MB/s per variant."""
+    from archiver import scan_tree
+
+    members = scan_tree(directory)
+    total_bytes = sum(size for _, size, _ in members.values())
+    workers = workers or os.cpu_count() or 1
+    variants = {
+        "serial_stored": lambda path: write_serial_zip(path, members),
+        "serial_deflate": lambda path: write_serial_zip(path, members, level=level),
+        "parallel_deflate": lambda path: write_parallel_zip(path, members, workers=workers, level=level),
+    }
+    results = {"files": len(members), "bytes": total_bytes, "workers": workers, "level": level, "variants": {}}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, run in variants.items():
+            output_path = os.path.join(tmp_dir, f"{name}.zip")
+            best = None
+            for _ in range(max(1, repeat)):
+                started = time.perf_counter()
+                run(output_path)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            results["variants"][name] = {
+                "seconds": round(best, 3),
+                "mb_per_s": round(total_bytes / (1024 * 1024) / best, 1) if best else None,
+                "archive_bytes": os.path.getsize(output_path),
+            }
+    return results
@@ -0,0 +1,94 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+_tracemalloc_lock = threading.Lock()
+
+
+def profile_call(func, args=(), kwargs=None, output_dir="profiles", label="run", top=25):
+    """Call `func` under cProfile and tracemalloc and write the reports to `output_dir`.
+
+    Writes `<label>-<timestamp>.pstats` (load with `pstats` or snakeviz) and a
+    `.txt` report with the top functions by cumulative time and the top
+    allocation sites by size. cProfile only sees the calling thread; tracemalloc
+    sees every thread, and only one call at a time can own it, so concurrent
+    profiled runs skip the allocation report.
+
+    Returns `(result, report, error)`: `report` holds the file paths (no
+    `.pstats` if another profiler was already active), duration and peak
+    traced memory, and `error` is the exception `func` raised (the
+    reports are written either way), else None.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    now = time.time()
+    stem = os.path.join(output_dir, f"{label}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}"
+                                    f"{int(now * 1000) % 1000:03d}-{os.getpid()}")
+    traced = _tracemalloc_lock.acquire(blocking=False)
+    if traced and tracemalloc.is_tracing():
+        _tracemalloc_lock.release()  # someone else (e.g. python -X tracemalloc) owns it
+        traced = False
+    if traced:
+        tracemalloc.start(10)
+    profiler = cProfile.Profile()
+    profiled = False
+    skipped = None
+    started = time.perf_counter()
+    error = None
+    result = None
+    try:
+        try:
+            profiler.enable()
+            profiled = True
+        except ValueError as e:  # another profiler is already active; run without cProfile
+            skipped = e
+        result = func(*args, **(kwargs or {}))
+    except Exception as e:
+        error = e
+    finally:
+        if profiled:
+            profiler.disable()
+        duration = time.perf_counter() - started
+        snapshot = None
+        peak = None
+        if traced:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            _tracemalloc_lock.release()
+
+    if profiled:
+        profiler.dump_stats(f"{stem}.pstats")
+    text = io.StringIO()
+    text.write(f"{label}: {duration:.3f}s" + (f", peak traced memory {peak} bytes" if peak is not None else "") + "\n")
+    if error is not None:
+        text.write(f"raised {type(error).__name__}: {error}\n")
+    if profiled:
+        text.write(f"\n== Top {top} functions by cumulative time ==\n")
+        pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(top)
+    else:
+        text.write(f"\n(function profile skipped: {skipped})\n")
+    if snapshot is not None:
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        text.write(f"\n== Top {top} allocation sites by size ==\n")
+        for stat in snapshot.statistics("lineno")[:top]:
+            text.write(f"{stat}\n")
+    else:
+        text.write("\n(allocation report skipped: tracemalloc was in use by another run)\n")
+    with open(f"{stem}.txt", "w", encoding="utf-8") as f:
+        f.write(text.getvalue())
+
+    report = {
+        "pstats": f"{stem}.pstats" if profiled else None,
+        "report": f"{stem}.txt",
+        "duration": round(duration, 3),
+        "peak_memory": peak,
+    }
+    return result, report, error
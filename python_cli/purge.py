@@ -0,0 +1,174 @@
+import fnmatch
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+MAX_ERRORS = 100
+MAX_SAMPLE = 20
+
+
+def normalize_formats(formats):
+    """Return a set of lower-case extensions with a leading dot ("LOG" -> ".log")."""
+    normalized = set()
+    for value in formats or []:
+        value = str(value).strip().lower()
+        if value:
+            normalized.add(value if value.startswith(".") else f".{value}")
+    return normalized
+
+
+class _Partial:
+    """Counters for one directory scan, merged into the run summary by the caller."""
+
+    __slots__ = ("files", "deleted", "bytes", "failed", "errors", "sample", "subdirs")
+
+    def __init__(self):
+        self.files = self.deleted = self.bytes = self.failed = 0
+        self.errors = []
+        self.sample = []
+        self.subdirs = []
+
+
+def _pruned(rel, name, exclude):
+    return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(rel, pattern) for pattern in exclude)
+
+
+def _purge_file(part, entry, cutoff, formats, dry_run):
+    """Delete one file (a DirEntry or a path) if it matches; update `part`."""
+    path = entry if isinstance(entry, str) else entry.path
+    # Cheap name check first; only candidates pay for a stat (cached on a DirEntry).
+    if os.path.splitext(path)[1].lower() not in formats:
+        return
+    st = os.stat(path, follow_symlinks=False) if isinstance(entry, str) else entry.stat(follow_symlinks=False)
+    if st.st_mtime >= cutoff:
+        return
+    if not dry_run:
+        os.remove(path)
+    part.deleted += 1
+    part.bytes += st.st_size
+    if len(part.sample) < MAX_SAMPLE:
+        part.sample.append(path)
+
+
+def _scan_dir(root, path, cutoff, formats, exclude, dry_run):
+    """Scan one directory: delete its matching files and return its subdirectories to visit."""
+    part = _Partial()
+    try:
+        entries = os.scandir(path)
+    except OSError as e:
+        part.failed += 1
+        part.errors.append({"path": path, "error": str(e)})
+        return part
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not exclude or not _pruned(os.path.relpath(entry.path, root).replace(os.sep, "/"), entry.name, exclude):
+                        part.subdirs.append(entry.path)
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                part.files += 1
+                _purge_file(part, entry, cutoff, formats, dry_run)
+            except FileNotFoundError:
+                continue  # removed by someone else in the meantime
+            except OSError as e:
+                part.failed += 1
+                if len(part.errors) < MAX_ERRORS:
+                    part.errors.append({"path": entry.path, "error": str(e)})
+    return part
+
+
+def _new_summary(directory, dry_run):
+    return {
+        "directory": directory,
+        "dry_run": bool(dry_run),
+        "dirs": 0,
+        "files": 0,
+        "deleted": 0,
+        "bytes_freed": 0,
+        "failed": 0,
+        "errors": [],
+        "sample": [],
+    }
+
+
+def _merge(summary, part):
+    summary["files"] += part.files
+    summary["deleted"] += part.deleted
+    summary["bytes_freed"] += part.bytes
+    summary["failed"] += part.failed
+    summary["errors"].extend(part.errors[:MAX_ERRORS - len(summary["errors"])])
+    summary["sample"].extend(part.sample[:MAX_SAMPLE - len(summary["sample"])])
+
+
+def purge_tree(directory, cutoff, formats, exclude=None, workers=4, dry_run=False):
+    """Delete files under `directory` with an extension in `formats` and an mtime before `cutoff`.
+
+    Directories are scanned with os.scandir and each one is a separate unit of
+    work on a thread pool, so subtrees are walked and purged concurrently.
+    Directories whose name or relative path matches an `exclude` glob are not
+    descended into. With `dry_run` nothing is removed and the summary reports
+    what would have been. The summary holds counts, bytes freed, the first few
+    paths and errors, never the full path list.
+    """
+    started = time.monotonic()
+    root = os.path.abspath(directory)
+    if not os.path.isdir(root):
+        raise NotADirectoryError(f"'{directory}' is not a directory")
+    formats = normalize_formats(formats)
+    exclude = list(exclude or [])
+    summary = _new_summary(root, dry_run)
+
+    with ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="purge") as pool:
+        pending = {pool.submit(_scan_dir, root, root, cutoff, formats, exclude, dry_run)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                part = future.result()
+                summary["dirs"] += 1
+                _merge(summary, part)
+                for subdir in part.subdirs:
+                    pending.add(pool.submit(_scan_dir, root, subdir, cutoff, formats, exclude, dry_run))
+
+    summary["duration"] = round(time.monotonic() - started, 3)
+    return summary
+
+
+def _in_excluded_dir(root, path, exclude):
+    parts = os.path.relpath(path, root).replace(os.sep, "/").split("/")[:-1]
+    if parts and parts[0] == "..":
+        return True
+    return any(_pruned("/".join(parts[:i + 1]), parts[i], exclude) for i in range(len(parts)))
+
+
+def purge_paths(directory, paths, cutoff, formats, exclude=None, dry_run=False):
+    """Apply the purge rules to specific files only (e.g. ones reported by a watcher).
+
+    Paths that no longer exist, are not regular files, lie outside `directory`
+    or under an excluded directory are ignored. Returns a summary in the same
+    shape as purge_tree.
+    """
+    started = time.monotonic()
+    root = os.path.abspath(directory)
+    formats = normalize_formats(formats)
+    exclude = list(exclude or [])
+    summary = _new_summary(root, dry_run)
+    part = _Partial()
+    for path in paths:
+        if _in_excluded_dir(root, path, exclude):
+            continue
+        try:
+            if not os.path.isfile(path) or os.path.islink(path):
+                continue
+            part.files += 1
+            _purge_file(part, path, cutoff, formats, dry_run)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            part.failed += 1
+            if len(part.errors) < MAX_ERRORS:
+                part.errors.append({"path": path, "error": str(e)})
+    _merge(summary, part)
+    summary["duration"] = round(time.monotonic() - started, 3)
+    return summary
@@ -0,0 +1,155 @@
+import hashlib
+import os
+import re
+
+import pandas as pd
+
+EMAIL_REGEX = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
+EMAIL_PATTERN = re.compile(EMAIL_REGEX)
+
+RECIPIENT_FORMATS = (".csv", ".xlsx")
+
+
+def validate_emails(emails):
+    """Return a boolean Series marking which entries of `emails` are valid addresses."""
+    emails = pd.Series(emails, dtype="string").str.strip()
+    return emails.str.fullmatch(EMAIL_REGEX).fillna(False).astype(bool)
+
+
+def _header_columns(first_row):
+    """Map a first row to column roles, or None if it is data rather than a header."""
+    cells = [str(cell).strip().lower() if cell is not None else "" for cell in first_row]
+    if "email" not in cells:
+        return None
+    return cells
+
+
+def _headerless_columns(width):
+    # The dashboard upload format is `name,email` per line; a single column is just addresses.
+    if width == 1:
+        return ["email"]
+    return ["name", "email"] + [f"extra_{i}" for i in range(width - 2)]
+
+
+def _finish_chunk(chunk):
+    if "name" not in chunk.columns:
+        chunk = chunk.assign(name="")
+    chunk = chunk[["email", "name"]]
+    chunk = chunk.assign(
+        email=chunk["email"].astype("string").fillna("").str.strip(),
+        name=chunk["name"].astype("string").fillna("").str.strip(),
+    )
+    return chunk.assign(valid=validate_emails(chunk["email"]).to_numpy())
+
+
+def _iter_csv_chunks(source, chunksize):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from _iter_csv_chunks(f, chunksize)
+        return
+
+    start = source.tell()
+    first_line = source.readline()
+    source.seek(start)
+    first_row = first_line.decode("utf-8-sig", errors="replace").rstrip("\r\n").split(",")
+    header = _header_columns(first_row)
+
+    reader = pd.read_csv(
+        source,
+        chunksize=chunksize,
+        dtype=str,
+        keep_default_na=False,
+        skip_blank_lines=True,
+        header=0 if header else None,
+        names=None if header else _headerless_columns(len(first_row)),
+        encoding="utf-8-sig",
+        on_bad_lines="skip",
+    )
+    with reader:
+        for chunk in reader:
+            if header:
+                chunk.columns = [str(c).strip().lower() for c in chunk.columns]
+            yield _finish_chunk(chunk)
+
+
+def _iter_xlsx_chunks(source, chunksize):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        first_row = next(rows, None)
+        if first_row is None:
+            return
+        columns = _header_columns(first_row)
+        buffered = []
+        if columns is None:
+            columns = _headerless_columns(len(first_row))
+            buffered.append(first_row)
+        for row in rows:
+            buffered.append(row)
+            if len(buffered) >= chunksize:
+                yield _finish_chunk(pd.DataFrame(buffered, columns=columns))
+                buffered = []
+        if buffered:
+            yield _finish_chunk(pd.DataFrame(buffered, columns=columns))
+    finally:
+        workbook.close()
+
+
+def iter_recipient_chunks(source, chunksize=10000, file_format=None):
+    """Yield recipient DataFrames (`email`, `name`, `valid`) of at most `chunksize` rows.
+
+    `source` is a path or a seekable binary file. CSV is read with a chunked
+    parser and XLSX through a read-only workbook, so memory use does not grow with
+    the list size. A header row is used when it has an `email` column; otherwise
+    rows are taken as `name,email` (or a single email column).
+    """
+    if file_format is None:
+        file_format = os.path.splitext(str(getattr(source, "name", source)))[1].lower()
+    if file_format == ".xlsx":
+        yield from _iter_xlsx_chunks(source, chunksize)
+    elif file_format in (".csv", ".txt", ""):
+        yield from _iter_csv_chunks(source, chunksize)
+    else:
+        raise ValueError("Unsupported email list format. Only CSV and XLSX are supported.")
+
+
+def iter_recipients(source, chunksize=10000):
+    """Yield `(email, name, valid)` for every recipient row in `source`."""
+    for chunk in iter_recipient_chunks(source, chunksize):
+        yield from zip(chunk["email"].tolist(), chunk["name"].tolist(), chunk["valid"].tolist())
+
+
+def count_recipients(source, chunksize=10000):
+    """Return `(valid, invalid)` counts for a recipient file."""
+    valid = invalid = 0
+    for chunk in iter_recipient_chunks(source, chunksize):
+        n_valid = int(chunk["valid"].sum())
+        valid += n_valid
+        invalid += len(chunk) - n_valid
+    return valid, invalid
+
+
+def store_recipient_file(stream, filename, directory, chunk_size=1024 * 1024):
+    """Copy an uploaded recipient list to `directory` without loading it into memory.
+
+    The file is named after a hash of its content so re-uploading the same list
+    maps to the same path. Returns the stored path.
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension not in RECIPIENT_FORMATS:
+        extension = ".csv"
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha1()
+    tmp_path = os.path.join(directory, f".upload-{os.getpid()}-{id(stream)}.tmp")
+    with open(tmp_path, "wb") as out:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            out.write(chunk)
+    path = os.path.join(directory, f"recipients_{digest.hexdigest()[:16]}{extension}")
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,229 @@
+import logging
+import re
+import smtplib
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+# Transport failures after which a connection cannot be trusted and is replaced.
+# Not OSError: every smtplib.SMTPException is one, and a refused message must not
+# be resent on a fresh connection.
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError, socket.timeout)
+
+_LEADING_DOT = re.compile(rb"(?m)^\.")
+_WRITE_BUFFER = 64 * 1024
+
+
+class _PooledConnection:
+    def __init__(self, smtp):
+        self.smtp = smtp
+        self.sends = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPPool:
+    """Pool of logged-in SMTP sessions shared by email sends.
+
+    Connections are opened (connect, STARTTLS, login) on demand, returned to the
+    pool after each send and reused by the next one. A connection is retired after
+    `max_sends_per_connection` messages or once it has been idle longer than
+    `max_idle` seconds, and replaced transparently if the server drops it.
+    """
+
+    def __init__(self, host, port, username=None, password=None, use_starttls=True,
+                 max_size=4, max_sends_per_connection=100, max_idle=60.0, timeout=30,
+                 smtp_class=smtplib.SMTP, logger=None):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_starttls = use_starttls
+        self.max_size = max(1, int(max_size))
+        self.max_sends_per_connection = max(1, int(max_sends_per_connection))
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.smtp_class = smtp_class
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._closed = False
+        self._stats = {"opened": 0, "reused": 0, "retired": 0, "reconnects": 0, "sent": 0, "failed": 0}
+
+    def send_segments(self, from_addr, to_addrs, segments):
+        """Send a message given as bytes segments and/or objects with a `chunks()` method.
+
+        Segments are streamed to the server one by one, so large attachment bodies
+        never have to be joined into a single in-memory message.
+        """
+        return self._deliver(lambda smtp: self._stream_message(smtp, from_addr, to_addrs, segments))
+
+    def _deliver(self, transaction):
+        for attempt in range(2):
+            with self.connection() as conn:
+                try:
+                    transaction(conn.smtp)
+                except CONNECTION_ERRORS:
+                    conn.sends = self.max_sends_per_connection  # do not return it to the pool
+                    if attempt == 0:
+                        self._count("reconnects")
+                        continue
+                    self._count("failed")
+                    raise
+                except Exception:
+                    # SMTP replies (550 refusals, data errors) leave the session usable.
+                    self._count("failed")
+                    raise
+                conn.sends += 1
+                self._count("sent")
+                return True
+
+    @staticmethod
+    def _stream_message(smtp, from_addr, to_addrs, segments):
+        """MAIL/RCPT/DATA exchange like `SMTP.sendmail`, writing the body incrementally."""
+        smtp.ehlo_or_helo_if_needed()
+        code, resp = smtp.mail(from_addr)
+        if code != 250:
+            smtp.rset()
+            raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+        refused = {}
+        for addr in to_addrs:
+            code, resp = smtp.rcpt(addr)
+            if code not in (250, 251):
+                refused[addr] = (code, resp)
+        if len(refused) == len(to_addrs):
+            smtp.rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        smtp.putcmd("data")
+        code, resp = smtp.getreply()
+        if code != 354:
+            smtp.rset()
+            raise smtplib.SMTPDataError(code, resp)
+        # Coalesce small pieces into larger writes; many tiny sends per message
+        # interact badly with Nagle/delayed ACK and stall each transaction.
+        pending = []
+        pending_size = 0
+        last = b"\r\n"
+        for segment in segments:
+            chunks = segment.chunks() if hasattr(segment, "chunks") else (segment,)
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                # Dot-stuff lines starting with "."; the start of a chunk is only a
+                # line start if the previous chunk ended with a newline.
+                stuffed = _LEADING_DOT.sub(b"..", chunk)
+                if chunk.startswith(b".") and not last.endswith(b"\n"):
+                    stuffed = stuffed[1:]
+                pending.append(stuffed)
+                pending_size += len(stuffed)
+                last = chunk
+                if pending_size >= _WRITE_BUFFER:
+                    smtp.send(b"".join(pending))
+                    pending = []
+                    pending_size = 0
+        pending.append(b".\r\n" if last.endswith(b"\r\n") else b"\r\n.\r\n")
+        smtp.send(b"".join(pending))
+        code, resp = smtp.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, resp)
+        return refused
+
+    @contextmanager
+    def connection(self):
+        """Check out a pooled connection; it is returned (or retired) on exit."""
+        if self._closed:
+            raise RuntimeError("SMTP pool is closed")
+        self._slots.acquire()
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+        except BaseException:
+            if conn is not None:
+                # The session may be mid-transaction; reset it or drop it.
+                try:
+                    conn.smtp.rset()
+                except Exception:
+                    conn.sends = self.max_sends_per_connection
+            raise
+        finally:
+            if conn is not None:
+                self._checkin(conn)
+            self._slots.release()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def stats(self):
+        """Return counts of connections opened versus reused and messages sent."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle"] = len(self._idle)
+            return stats
+
+    def close(self):
+        """Close all idle connections and refuse further checkouts."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._quit(conn)
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _checkout(self):
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                break
+            if self.max_idle is not None and now - conn.last_used > self.max_idle:
+                self._quit(conn)
+                continue
+            self._count("reused")
+            return conn
+        conn = _PooledConnection(self._open())
+        self._count("opened")
+        return conn
+
+    def _checkin(self, conn):
+        conn.last_used = time.monotonic()
+        if conn.sends >= self.max_sends_per_connection or self._closed:
+            self._quit(conn)
+            return
+        with self._lock:
+            self._idle.append(conn)
+
+    def _open(self):
+        smtp = self.smtp_class(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.use_starttls:
+                smtp.starttls()
+                smtp.ehlo()
+            if self.username and self.password and smtp.has_extn("auth"):
+                smtp.login(self.username, self.password)
+        except Exception:
+            try:
+                smtp.close()
+            except Exception:
+                pass
+            raise
+        return smtp
+
+    def _quit(self, conn):
+        self._count("retired")
+        try:
+            conn.smtp.quit()
+        except Exception:
+            try:
+                conn.smtp.close()
+            except Exception:
+                pass
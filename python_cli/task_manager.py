@@ -1,36 +1,79 @@
 # ```python
 import os
-import re
-import shutil
 import time
 import logging
 import json
 import threading
 import argparse
 import requests
-import pandas as pd
-import smtplib
-import zipfile
-import tarfile
-from bs4 import BeautifulSoup
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor as SchedulerThreadPool
 from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, EVENT_SCHEDULER_SHUTDOWN, EVENT_SCHEDULER_START
 from pymongo import MongoClient
-from docx import Document
-from fpdf import FPDF
 from dotenv import load_dotenv
-import uuid
+import multiprocessing.util
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from log_sink import MongoLogSink
+from task_store import TaskStore
+from smtp_pool import SMTPPool
+from mail_merge import MailMerge
+from attachments import AttachmentCache, compose_message
+from archiver import COMPRESSION_FORMATS, DELETED_MEMBER, ArchiveState, consolidate, diff_tree, scan_tree, write_archive
+from parallel_zip import benchmark_zip
+from purge import purge_paths, purge_tree
+from organizer import build_extension_map, category_folders, load_category_map, organize_directory, organize_paths
+from watcher import DirectoryWatcher, inotify_available
+from dir_index import DirectoryIndex
+from job_gate import JobGate, resource_key
+from metrics import Metrics
+from profiling import profile_call
+from http_fetch import HttpFetcher
+from gold_rate import GOLD_RATE_URL, PriceHistory, extract_gold_price
+from gold_analytics import QUERIES as GOLD_RATE_QUERIES, GoldRateAnalytics
+from convert_manifest import ConversionManifest
+from converters import convert, get_converter, input_formats, output_formats, supported_conversions
+from recipients import EMAIL_PATTERN, iter_recipients, validate_emails
 
 # Load environment variables
 load_dotenv()
 
+# Scheduler executor each task type runs on unless the task sets "executor":
+# "io" runs jobs in threads, "cpu" hands them to worker processes (see run_in_worker).
+EXECUTORS = ("io", "cpu")
+TASK_EXECUTORS = {
+    "organize_files": "io",
+    "delete_files": "io",
+    "send_email": "io",
+    "get_gold_rate": "io",
+    "convert_file": "cpu",
+    "compress_files": "cpu",
+}
+
+# Summary fields of each task's result recorded as per-run metrics: {field: metric item}.
+RUN_ITEMS = {
+    "organize_files": {"moved": "files_moved", "renamed": "files_renamed", "failed": "files_failed"},
+    "delete_files": {"files": "files_scanned", "deleted": "files_deleted", "bytes_freed": "bytes_freed", "failed": "files_failed"},
+    "send_email": {"sent": "emails_sent", "failed": "emails_failed", "invalid": "emails_invalid"},
+    "get_gold_rate": {},
+    "convert_file": {"converted": "files_converted", "skipped": "files_unchanged", "failed": "files_failed"},
+    "compress_files": {"files": "files_compressed", "bytes": "bytes_compressed", "archive_bytes": "archive_bytes"},
+}
+
+
 class TaskManager:
-    def __init__(self):
-        """Initialize TaskManager with logging, MongoDB, and scheduler."""
+    def __init__(self, worker=False):
+        """Initialize TaskManager with logging, MongoDB, and scheduler.
+
+        A `worker` instance runs jobs inside a "cpu" executor process and does not
+        load or schedule the stored tasks. So does any TaskManager built inside a
+        multiprocessing child: spawned workers re-import the parent's main module,
+        and one built there at import time must not run the stored jobs again.
+        """
+        if not worker and multiprocessing.current_process().name != "MainProcess":
+            worker = True
+        self.worker = worker
         self.task_lock = threading.Lock()
         # Logging Configuration
         logging.basicConfig(
@@ -46,11 +89,96 @@ class TaskManager:
         self.db = self.client["task_manager_db"]
         self.logs_collection = self.db["logs"]
 
-        # Scheduler Configuration
-        self.scheduler = BackgroundScheduler()
+        # Buffered log writer: entries are batched with insert_many in the background
+        self.log_sink = MongoLogSink(
+            self.logs_collection,
+            batch_size=int(os.getenv("MONGO_LOG_BATCH_SIZE", 500)),
+            flush_interval=float(os.getenv("MONGO_LOG_FLUSH_INTERVAL", 1.0)),
+            max_queue=int(os.getenv("MONGO_LOG_MAX_QUEUE", 10000)),
+            policy=os.getenv("MONGO_LOG_POLICY", "block"),
+            logger=self.logger,
+        )
+
+        # SMTP Configuration (sessions are pooled and reused across sends)
+        self.smtp_host = os.getenv("SMTP_HOST", "smtp.gmail.com")
+        self.smtp_port = int(os.getenv("SMTP_PORT", 587))
+        self.smtp_starttls = os.getenv("SMTP_STARTTLS", "1") != "0"
+        self.smtp_max_sends_per_connection = int(os.getenv("SMTP_MAX_SENDS_PER_CONNECTION", 100))
+        self.smtp_pool = None
+        self.smtp_pool_lock = threading.Lock()
+
+        # Mail-merge Configuration
+        self.email_workers = int(os.getenv("EMAIL_WORKERS", 4))
+        self.email_rate = float(os.getenv("EMAIL_RATE", 0))  # messages per second, 0 = unlimited
+        self.email_max_retries = int(os.getenv("EMAIL_MAX_RETRIES", 3))
+        self.recipient_chunk_size = int(os.getenv("EMAIL_RECIPIENT_CHUNK_SIZE", 10000))
+
+        # File Conversion Configuration (worker processes per convert_file run, 1 = serial)
+        self.convert_workers = int(os.getenv("CONVERT_WORKERS", 1))
+        self.convert_pool = None  # shared by all runs, grown to the largest `workers` asked for
+        self.convert_pool_size = 0
+        self.convert_pool_lock = threading.Lock()
+
+        # File Deletion Configuration (threads scanning subtrees in parallel)
+        self.delete_workers = int(os.getenv("DELETE_WORKERS", 4))
+
+        # Web Scraping Configuration (one keep-alive session shared by scrape tasks)
+        self.gold_rate_url = os.getenv("GOLD_RATE_URL", GOLD_RATE_URL)
+        self.http = HttpFetcher(timeout=float(os.getenv("HTTP_TIMEOUT", 10)))
+        self.price_history = PriceHistory(os.getenv("GOLD_RATE_HISTORY", "gold_rates.csv"))
+        self.gold_rate_excel = "gold_rates.xlsx"
+        self.gold_analytics = GoldRateAnalytics(self.price_history)
+
+        # Directory Index Configuration (persistent per-root metadata used with --use-index)
+        self.dir_index_dir = os.getenv("DIR_INDEX_DIR", "dir_index")
+        self.dir_indexes = {}
+        self.dir_index_lock = threading.Lock()
+
+        # Zip Compression Configuration (threads deflating members, 1 = serial; no level = stored)
+        self.zip_workers = int(os.getenv("ZIP_WORKERS", 1))
+        zip_level = os.getenv("ZIP_COMPRESSION_LEVEL")
+        self.zip_compression_level = int(zip_level) if zip_level else None
+        self.attachment_cache = AttachmentCache(
+            max_memory_bytes=int(os.getenv("EMAIL_ATTACHMENT_MEMORY_CAP", 32 * 1024 * 1024)),
+            max_spool_bytes=int(os.getenv("EMAIL_ATTACHMENT_SPOOL_CAP", 1024 * 1024 * 1024)),
+        )
+
+        # Scheduler Configuration (named executors: threads for I/O-bound tasks, processes for CPU-bound ones)
+        self.io_workers = int(os.getenv("IO_WORKERS", 10))
+        self.cpu_workers = int(os.getenv("CPU_WORKERS") or os.cpu_count() or 1)
+        self.cpu_pool = None
+        self.cpu_pool_lock = threading.Lock()
+        # Overlapping or missed runs of a job are coalesced into one; runs then queue in the
+        # job gate for a global slot and for the directories they touch.
+        self.misfire_grace_time = int(os.getenv("MISFIRE_GRACE_TIME", 60))
+        self.queue_lag_warning = float(os.getenv("QUEUE_LAG_WARNING", 30))
+        self.job_gate = JobGate(int(os.getenv("MAX_CONCURRENT_JOBS", 4)))
+        self.job_skips = {}
+        self.metrics = Metrics()
+
+        # Profiling Configuration (cProfile + tracemalloc reports of runs armed with `profile --runs N`)
+        self.profile_dir = os.getenv("PROFILE_DIR", "profiles")
+        self.profile_top = int(os.getenv("PROFILE_TOP", 25))
+        self.scheduler = BackgroundScheduler(
+            executors={
+                "io": SchedulerThreadPool(self.io_workers),
+                "cpu": SchedulerThreadPool(self.cpu_workers),
+            },
+            job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": self.misfire_grace_time},
+        )
+        self.scheduler.add_listener(self._on_scheduler_start, EVENT_SCHEDULER_START)
+        self.scheduler.add_listener(self._on_scheduler_shutdown, EVENT_SCHEDULER_SHUTDOWN)
+        self.scheduler.add_listener(self._on_job_skipped, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES)
+
+        # Watch Mode Configuration (inotify watchers started with the scheduler)
+        self.watch_debounce = float(os.getenv("WATCH_DEBOUNCE", 2.0))
+        self.watch_max_delay = float(os.getenv("WATCH_MAX_DELAY", 30.0))
+        self.watch_tasks = {}
+        self.watchers = {}
 
-        # Task Storage File
+        # Task Storage File (cached snapshot + append-only journal)
         self.tasks_file = "scheduled_tasks.json"
+        self.task_store = TaskStore(self.tasks_file)
 
         # File Types for Organization
         self.file_types = {
@@ -63,12 +191,17 @@ class TaskManager:
             "Code": [".py", ".js", ".html", ".css", ".java", ".cpp", ".c", ".php"],
             "Data": [".csv", ".json", ".xml", ".sql", ".db"],
         }
+        category_map = os.getenv("ORGANIZE_CATEGORY_MAP")
+        if category_map:
+            self.file_types = load_category_map(category_map)
+        self.extension_map = build_extension_map(self.file_types)
 
         # Load and schedule existing tasks
-        self.load_and_schedule_tasks()
+        if not worker:
+            self.load_and_schedule_tasks()
 
     def log_to_mongodb(self, task_name, details, status, level="INFO"):
-        """Log actions to MongoDB."""
+        """Queue a log entry for batched writing to MongoDB."""
         log_entry = {
             "task_name": task_name,
             "details": details,
@@ -76,69 +209,239 @@ class TaskManager:
             "level": level,
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
         }
-        self.logs_collection.insert_one(log_entry)
+        self.log_sink.put(log_entry)
+
+    def log_stats(self):
+        """Return queued/flushed/dropped counters of the MongoDB log sink."""
+        return self.log_sink.stats()
+
+    def _on_scheduler_start(self, event):
+        """Start the directory watchers of watch-mode tasks."""
+        for task_name in list(self.watch_tasks):
+            self._start_watcher(task_name)
+
+    def _on_scheduler_shutdown(self, event):
+        """Flush buffered MongoDB logs and close pooled SMTP sessions when the scheduler shuts down."""
+        for task_name in list(self.watchers):
+            self._stop_watcher(task_name)
+        if self.cpu_pool is not None:
+            self.cpu_pool.shutdown(wait=True)
+        self.close_convert_pool()
+        self.http.close()
+        if self.smtp_pool is not None:
+            self.smtp_pool.close()
+            self.logger.info(f"SMTP pool closed: {self.smtp_pool.stats()}")
+        self.log_sink.close()
+
+    def _on_job_skipped(self, event):
+        """Count runs dropped because the previous run was still going or the run was too late."""
+        kind = "missed" if event.code == EVENT_JOB_MISSED else "overlapped"
+        counts = self.job_skips.setdefault(event.job_id, {"missed": 0, "overlapped": 0})
+        counts[kind] += 1
+        self.metrics.inc("job_skipped_total", task=event.job_id, reason=kind)
+        self.logger.info(f"Skipped a run of '{event.job_id}' ({kind}); it is coalesced into the next run")
+
+    def job_stats(self):
+        """Return the job gate's queue state with queue lag and skipped runs per job."""
+        stats = self.job_gate.stats()
+        for job_id, counts in list(self.job_skips.items()):
+            stats["jobs"].setdefault(job_id, {"runs": 0, "queued": 0, "wait_last": None, "wait_avg": None, "wait_max": None})
+            stats["jobs"][job_id].update(counts)
+        return stats
+
+    def get_smtp_pool(self, sender_email, sender_password):
+        """Return the shared SMTP pool, recreating it if the credentials changed."""
+        with self.smtp_pool_lock:
+            pool = self.smtp_pool
+            if pool is None or pool.closed or (pool.username, pool.password) != (sender_email, sender_password):
+                if pool is not None:
+                    pool.close()
+                pool = SMTPPool(
+                    self.smtp_host,
+                    self.smtp_port,
+                    username=sender_email,
+                    password=sender_password,
+                    use_starttls=self.smtp_starttls,
+                    max_size=self.email_workers,
+                    max_sends_per_connection=self.smtp_max_sends_per_connection,
+                    logger=self.logger,
+                )
+                self.smtp_pool = pool
+            return pool
+
+    def smtp_stats(self):
+        """Return connection reuse counters of the SMTP pool."""
+        return self.smtp_pool.stats() if self.smtp_pool is not None else {}
 
     def load_tasks(self):
-        """Load tasks from the JSON file."""
-        try:
-            with open(self.tasks_file, "r") as f:
-                tasks = json.load(f)
-                return tasks if isinstance(tasks, dict) else {}
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+        """Load tasks from the cached task store."""
+        return self.task_store.all()
 
     def save_tasks(self, tasks):
-        """Save tasks to the JSON file."""
-        with open(self.tasks_file, "w") as f:
-            json.dump(tasks, f, indent=4)
-
-    def organize_files(self, directory):
-        """Organize files in the given directory based on their extensions."""
+        """Replace all stored tasks with an atomic snapshot write."""
+        self.task_store.replace_all(tasks)
+
+    def get_dir_index(self, directory):
+        """Return the shared persistent index of `directory`'s tree."""
+        root = os.path.realpath(directory)
+        with self.dir_index_lock:
+            index = self.dir_indexes.get(root)
+            if index is None:
+                index = self.dir_indexes[root] = DirectoryIndex(root, self.dir_index_dir)
+            return index
+
+    def organize_files(self, directory, recursive=False, category_map=None, paths=None, use_index=False):
+        """Organize files in the given directory based on their extensions.
+
+        `category_map` is an optional JSON file of `{folder: [extensions]}` used
+        instead of the default file types; `recursive` also gathers files from
+        subdirectories. `paths` limits the run to those files (watch mode). With
+        `use_index` the candidates come from the refreshed directory index
+        instead of a full listing. Logs one summary per run rather than one entry per file.
+        """
         try:
-            files = [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
-            for file in files:
-                file_extension = os.path.splitext(file)[1].lower()
-                category = "Others"
-                for folder_name, extensions in self.file_types.items():
-                    if file_extension in extensions:
-                        category = folder_name
-                        break
-                category_folder = os.path.join(directory, category)
-                if not os.path.exists(category_folder):
-                    os.makedirs(category_folder)
-                shutil.move(os.path.join(directory, file), os.path.join(category_folder, file))
-                self.logger.info(f"Moved '{file}' to '{category}' folder.")
-                self.log_to_mongodb("organize_files", {"file": file, "category": category}, "File moved")
-            self.logger.info(f"File organization in '{directory}' completed successfully.")
-            self.log_to_mongodb("organize_files", {"directory": directory}, "Organization completed")
+            extension_map = self._extension_map(category_map)
+            if paths is None and use_index:
+                index = self.get_dir_index(directory)
+                index.refresh()
+                directory = index.root
+                paths = index.files_in(directory, recursive=recursive, skip_dirs=category_folders(directory, extension_map))
+            if paths is not None:
+                summary = organize_paths(directory, paths, extension_map, recursive=recursive)
+            else:
+                summary = organize_directory(directory, extension_map, recursive=recursive)
+            details = {k: v for k, v in summary.items() if v or k == "moved"}
+            if summary["failed"]:
+                self.logger.warning(f"Organized '{directory}' with {summary['failed']} failure(s): {details}")
+                self.log_to_mongodb("organize_files", details, "Organization completed with errors", level="WARNING")
+            else:
+                self.logger.info(f"File organization in '{directory}' completed successfully: {summary['moved']} file(s) moved.")
+                self.log_to_mongodb("organize_files", details, "Organization completed")
+            return summary
         except Exception as e:
             self.logger.error(f"Error organizing files in '{directory}': {e}")
             self.log_to_mongodb("organize_files", {"directory": directory, "error": str(e)}, "Error", level="ERROR")
+            return None
 
-    def delete_files(self, directory, age_days, formats):
-        """Delete files older than `age_days` and matching `formats`."""
+    def _extension_map(self, category_map=None):
+        if category_map:
+            return build_extension_map(load_category_map(category_map))
+        return self.extension_map
+
+    def _watch_callback(self, task_name, details):
+        """Return the watcher callback running a task on the changed files (None = full run).
+
+        Watch-triggered runs queue in the job gate like scheduled ones.
+        """
+        resources = self._task_resources(details)
+        if details["task_type"] == "organize_files":
+            def run(paths):
+                return self.organize_files(
+                    details["directory"],
+                    recursive=details.get("recursive", False),
+                    category_map=details.get("category_map"),
+                    paths=paths,
+                )
+        else:
+            def run(paths):
+                return self.delete_files(
+                    details["directory"],
+                    details["age_days"],
+                    details["formats"],
+                    dry_run=details.get("dry_run", False),
+                    exclude=details.get("exclude"),
+                    workers=details.get("workers"),
+                    paths=paths,
+                )
+
+        def on_change(paths):
+            self._instrumented_run(task_name, details["task_type"], "watch", resources, None, run, paths)
+        return on_change
+
+    def _start_watcher(self, task_name):
+        """Start the inotify watcher of a watch-mode task; the interval job stays as a full reconcile."""
+        details = self.watch_tasks.get(task_name)
+        if details is None or task_name in self.watchers:
+            return
+        if not inotify_available():
+            self.logger.warning(f"inotify is not available; '{task_name}' falls back to its reconcile interval")
+            return
+        skip_dirs = ()
+        if details["task_type"] == "organize_files":
+            skip_dirs = category_folders(details["directory"], self._extension_map(details.get("category_map")))
+        watcher = DirectoryWatcher(
+            details["directory"],
+            self._watch_callback(task_name, details),
+            recursive=details.get("recursive", False) if details["task_type"] == "organize_files" else True,
+            debounce=self.watch_debounce,
+            max_delay=self.watch_max_delay,
+            skip_dirs=skip_dirs,
+            logger=self.logger,
+        )
         try:
-            cutoff_time = time.time() - (age_days * 86400)
-            deleted_files = []
-            for root, _, files in os.walk(directory):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    file_extension = os.path.splitext(file)[1].lower()
-                    if file_extension in formats and os.path.getmtime(file_path) < cutoff_time:
-                        os.remove(file_path)
-                        deleted_files.append(file_path)
-                        self.logger.info(f"Deleted file: {file_path}")
-            if deleted_files:
-                self.log_to_mongodb("delete_files", {"deleted_files": deleted_files}, "Files deleted")
+            watcher.start()
+        except OSError as e:
+            self.logger.error(f"Failed to watch '{details['directory']}' for '{task_name}': {e}")
+            return
+        self.watchers[task_name] = watcher
+        self.logger.info(f"Watching '{details['directory']}' for task '{task_name}'")
+
+    def _stop_watcher(self, task_name):
+        watcher = self.watchers.pop(task_name, None)
+        if watcher is not None:
+            watcher.stop()
+
+    def delete_files(self, directory, age_days, formats, dry_run=False, exclude=None, workers=None, paths=None,
+                     use_index=False):
+        """Delete files older than `age_days` and matching `formats`.
+
+        Subtrees are scanned in parallel (`workers` threads) and directories
+        matching an `exclude` glob are skipped. With `dry_run` nothing is removed.
+        `paths` limits the run to those files (watch mode). With `use_index` the
+        candidates are queried from the refreshed directory index rather than
+        found by walking the tree. Logs and returns a summary of counts and bytes freed.
+        """
+        try:
+            cutoff_time = time.time() - (float(age_days) * 86400)
+            if paths is None and use_index:
+                index = self.get_dir_index(directory)
+                index.refresh()
+                directory = index.root
+                paths = [path for path, _, _ in index.older_than(cutoff_time, formats)]
+            if paths is not None:
+                summary = purge_paths(directory, paths, cutoff_time, formats, exclude=exclude, dry_run=dry_run)
             else:
-                self.logger.info("No files deleted.")
-                self.log_to_mongodb("delete_files", {}, "No files deleted")
+                summary = purge_tree(
+                    directory,
+                    cutoff_time,
+                    formats,
+                    exclude=exclude,
+                    workers=workers or self.delete_workers,
+                    dry_run=dry_run,
+                )
+            action = "Would delete" if dry_run else "Deleted"
+            self.logger.info(
+                f"{action} {summary['deleted']} file(s) ({summary['bytes_freed']} bytes) in '{directory}'; "
+                f"scanned {summary['files']} file(s) in {summary['dirs']} dir(s), {summary['failed']} failure(s)"
+            )
+            if summary["deleted"]:
+                status = "Files would be deleted (dry run)" if dry_run else "Files deleted"
+            else:
+                status = "No files deleted"
+            self.log_to_mongodb("delete_files", summary, status, level="WARNING" if summary["failed"] else "INFO")
+            return summary
         except Exception as e:
             self.logger.error(f"Error deleting files: {e}")
             self.log_to_mongodb("delete_files", {"directory": directory, "age_days": age_days, "formats": formats}, f"Error: {e}", level="ERROR")
+            return None
 
-    def send_email(self, recipient_email, subject, message, attachments=None):
-        """Send email(s) with optional attachments."""
+    def send_email(self, recipient_email, subject, message, attachments=None, workers=None, rate=None, on_result=None):
+        """Send email(s) with optional attachments through the mail-merge engine.
+
+        Returns a report with sent/failed/invalid counts and a sample of at most
+        100 failed or invalid recipients, or False if the run could not start.
+        `on_result`, if given, is called with every per-recipient result.
+        """
         SENDER_EMAIL = os.getenv("SENDER_EMAIL")
         SENDER_PASSWORD = os.getenv("SENDER_PASSWORD")
         if not SENDER_EMAIL or not SENDER_PASSWORD:
@@ -153,14 +456,10 @@ class TaskManager:
         self.logger.info(f"  Attachments: {attachments}")
 
         if isinstance(recipient_email, str) and (recipient_email.endswith(".csv") or recipient_email.endswith(".xlsx")):
-            # Handle CSV or XLSX file
+            # Handle CSV or XLSX file, streamed in chunks and validated per chunk
             try:
-                if recipient_email.endswith(".csv"):
-                    df = pd.read_csv(recipient_email)
-                elif recipient_email.endswith(".xlsx"):
-                    df = pd.read_excel(recipient_email)
-                else:
-                    raise ValueError("Unsupported email list format. Only CSV and XLSX are supported.")
+                if not os.path.isfile(recipient_email):
+                    raise FileNotFoundError(f"Recipient list '{recipient_email}' not found.")
 
                 if os.path.isfile(message):
                     with open(message, "r") as f:
@@ -168,18 +467,7 @@ class TaskManager:
                 else:
                     message_template = message
 
-                for index, row in df.iterrows():
-                    email = row.get("email")
-                    name = row.get("name", "")  # Get name, default to empty string if not found
-                    if not self.is_valid_email(email):
-                        self.logger.warning(f"Invalid email: {email}")
-                        continue
-                    msg_content = message_template.replace("{name}", name)
-                    if self._send_single_email([email], subject, msg_content, attachments):
-                        self.logger.info(f"Email sent to {email}")
-                    else:
-                        self.logger.error(f"Email failed to {email}")
-
+                recipients = iter_recipients(recipient_email, chunksize=self.recipient_chunk_size)
             except Exception as e:
                 self.logger.error(f"Error sending emails from file: {e}")
                 return False
@@ -192,9 +480,10 @@ class TaskManager:
                 self.logger.error("Invalid recipient_email format. Expected a string or list.")
                 return False
 
-            # Filter out invalid email addresses
-            valid_emails = [email for email in recipient_email if self.is_valid_email(email)]
-            invalid_emails = [email for email in recipient_email if not self.is_valid_email(email)]
+            # Filter out invalid email addresses (validated as one vectorized pass)
+            valid_mask = validate_emails(recipient_email).tolist()
+            valid_emails = [email for email, valid in zip(recipient_email, valid_mask) if valid]
+            invalid_emails = [email for email, valid in zip(recipient_email, valid_mask) if not valid]
 
             if invalid_emails:
                 self.logger.warning(f"Invalid email addresses: {invalid_emails}")
@@ -203,92 +492,94 @@ class TaskManager:
                 self.logger.error("No valid email addresses found.")
                 return False
 
-            for email in valid_emails:
-                # Simple name extraction (you might need a more robust method)
-                name = email.split("@")[0]
-                msg_content = message.replace("{name}", name)
-
-                if self._send_single_email([email], subject, msg_content, attachments):
-                    self.logger.info(f"Email sent to {email}")
-                else:
-                    self.logger.error(f"Failed to send email to {email}")
-
-    def _send_single_email(self, recipient_emails, subject, message, attachments=None):
-        """Helper method to send a single email to a list of recipients."""
-        SENDER_EMAIL = os.getenv("SENDER_EMAIL")
-        SENDER_PASSWORD = os.getenv("SENDER_PASSWORD")
-        if not SENDER_EMAIL or not SENDER_PASSWORD:
-            self.logger.error("Missing email credentials in .env file.")
-            return False
-
-        msg = MIMEMultipart()
-        msg["From"] = SENDER_EMAIL
-        msg["To"] = ", ".join(recipient_emails)
-        msg["Subject"] = subject
-        msg.attach(MIMEText(message, "plain"))
-
-        if attachments:
-            for attachment in attachments:
-                try:
-                    with open(attachment, "rb") as file:
-                        part = MIMEBase("application", "octet-stream")
-                        part.set_payload(file.read())
-                    encoders.encode_base64(part)
-                    part.add_header("Content-Disposition", f"attachment; filename={os.path.basename(attachment)}")
-                    msg.attach(part)
-                except FileNotFoundError:
-                    self.logger.error(f"Attachment '{attachment}' not found.")
-
+            message_template = message
+            # Simple name extraction (you might need a more robust method)
+            recipients = ((email, email.split("@")[0], True) for email in valid_emails)
+
+        # Attachments are read and encoded once per run (and cached across runs);
+        # only the headers and text part are rebuilt per recipient.
+        encoded_attachments = self._load_attachments(attachments)
+
+        def deliver(email, body):
+            segments = compose_message(SENDER_EMAIL, [email], subject, body, encoded_attachments)
+            self.get_smtp_pool(SENDER_EMAIL, SENDER_PASSWORD).send_segments(SENDER_EMAIL, [email], segments)
+
+        merge = MailMerge(
+            deliver,
+            message_template,
+            workers=workers or self.email_workers,
+            rate=self.email_rate if rate is None else rate,
+            max_retries=self.email_max_retries,
+            validate=self.is_valid_email,
+            logger=self.logger,
+            on_result=on_result,
+        )
         try:
-            server = smtplib.SMTP("smtp.gmail.com", 587)
-            server.starttls()
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
-            server.sendmail(SENDER_EMAIL, recipient_emails, msg.as_string())
-            server.quit()
-            return True
+            report = merge.run(recipients)
         except Exception as e:
-            self.logger.error(f"Failed to send email to {recipient_emails}: {e}")
+            self.logger.error(f"Error sending emails: {e}")
+            self.log_to_mongodb("send_email", {"subject": subject, "error": str(e)}, f"Error: {e}", level="ERROR")
             return False
+        finally:
+            self.attachment_cache.release(encoded_attachments)
+
+        summary = {k: report[k] for k in ("sent", "failed", "invalid", "duration")}
+        self.logger.info(f"Email run finished: {summary}")
+        self.log_to_mongodb(
+            "send_email",
+            {"subject": subject, **summary, "failed_recipients": [r["email"] for r in report["failures"] if r["status"] == "failed"]},
+            "Emails sent" if not report["failed"] else "Emails sent with failures",
+            level="INFO" if not report["failed"] else "WARNING",
+        )
+        return report
+
+    def _load_attachments(self, attachments):
+        """Return encoded attachments from the cache, skipping missing files.
+
+        The entries are pinned; hand them back with `attachment_cache.release`.
+        """
+        encoded = []
+        for attachment in attachments or []:
+            try:
+                encoded.append(self.attachment_cache.get(attachment))
+            except FileNotFoundError:
+                self.logger.error(f"Attachment '{attachment}' not found.")
+        return encoded
 
     def is_valid_email(self, email):
         """Validate email format."""
-        pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
-        return re.match(pattern, email) is not None
+        return isinstance(email, str) and EMAIL_PATTERN.match(email) is not None
     def get_gold_rate(self):
-        """Scrape gold rates from a website and store in an Excel file with improved error handling."""
-        url = "https://www.bankbazaar.com/gold-rate-tamil-nadu.html"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
+        """Scrape gold rates from a website and append them to the price history with improved error handling.
 
+        The page is fetched through the shared keep-alive session with
+        ETag/Last-Modified revalidation; on 304 or an identical body the last
+        parsed price is reused without parsing the page again.
+        """
         try:
-            response = requests.get(url, headers=headers, timeout=10) # Added timeout.
-            response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-
-            soup = BeautifulSoup(response.text, "html.parser")
-            price_span = soup.find("span", class_="white-space-nowrap")
+            result = self.http.fetch(self.gold_rate_url, extract=extract_gold_price)
+            gold_price = result.value
 
-            if price_span:
-                gold_price = price_span.get_text(strip=True)
-                self.logger.info(f"22k India Gold rate: {gold_price}")
+            if gold_price:
+                if result.changed:
+                    self.logger.info(f"22k India Gold rate: {gold_price}")
+                else:
+                    self.logger.info(f"22k India Gold rate unchanged (HTTP {result.status}): {gold_price}")
 
-                excel_file = "gold_rates.xlsx"
                 timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+                price = None
 
                 try:
-                    if os.path.exists(excel_file):
-                        df = pd.read_excel(excel_file)
-                        new_row = {"Timestamp": timestamp, "22k India Gold Price": gold_price}
-                        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-                        df.to_excel(excel_file, index=False)
-                    else:
-                        df = pd.DataFrame({"Timestamp": [timestamp], "22k India Gold Price": [gold_price]})
-                        df.to_excel(excel_file, index=False)
+                    if not os.path.exists(self.price_history.path):
+                        imported = self.price_history.import_excel(self.gold_rate_excel)
+                        if imported:
+                            self.logger.info(f"Imported {imported} gold rate(s) from {self.gold_rate_excel}")
+                    price = self.price_history.append(timestamp, gold_price)
                 except Exception as e:
-                    self.logger.error(f"Error writing to excel file: {e}")
+                    self.logger.error(f"Error writing to price history: {e}")
 
-                self.logger.info(f"Gold rate stored in {excel_file}")
-                self.log_to_mongodb("get_gold_rate", {"gold_price": gold_price, "timestamp": timestamp}, "Gold rate stored")
+                self.logger.info(f"Gold rate stored in {self.price_history.path}")
+                self.log_to_mongodb("get_gold_rate", {"gold_price": gold_price, "price": price, "timestamp": timestamp, "changed": result.changed}, "Gold rate stored")
 
                 return gold_price
             else:
@@ -301,167 +592,273 @@ class TaskManager:
         except Exception as e:
             self.logger.error(f"An unexpected error occurred: {e}")
             return None
-    def convert_file(self, input_dir, output_dir, input_format, output_format):
-        """Convert files in the input directory to the output directory."""
+
+    def export_gold_rates(self, excel_file=None):
+        """Export the gold price history to an Excel workbook."""
+        excel_file = excel_file or self.gold_rate_excel
+        try:
+            rows = self.price_history.export_excel(excel_file)
+            self.logger.info(f"Exported {rows} gold rate(s) to {excel_file}")
+            self.log_to_mongodb("export_gold_rates", {"output": excel_file, "rows": rows}, "Gold rates exported")
+            return rows
+        except Exception as e:
+            self.logger.error(f"Error exporting gold rates: {e}")
+            self.log_to_mongodb("export_gold_rates", {"output": excel_file}, f"Error: {e}", level="ERROR")
+            return None
+
+    def gold_rate_analytics(self, query="summary", window=None, periods=1, start=None, end=None):
+        """Run an analytics query over the gold price history.
+
+        The history is kept parsed in memory and only appended samples are read
+        on later calls. Raises ValueError for an unknown query or window.
+        """
+        return self.gold_analytics.query(query, window=window, periods=periods, start=start, end=end)
+
+    def convert_file(self, input_dir, output_dir, input_format, output_format, workers=None, incremental=False, use_hash=False):
+        """Convert files in the input directory to the output directory.
+
+        With `workers` > 1 the files are spread across a process pool; each file's
+        errors stay isolated and the run returns one summary. With `incremental`,
+        a manifest in `output_dir` is used to skip sources unchanged since their
+        last conversion (compared by size and mtime, plus content hash with
+        `use_hash`) and to remove outputs whose source was deleted.
+        """
+        workers = workers or self.convert_workers
+        started = time.monotonic()
+        summary = {"converted": 0, "failed": 0, "skipped": 0, "removed": 0, "errors": []}
         try:
+            get_converter(input_format, output_format)  # fail fast on unsupported pairs
             if not os.path.exists(output_dir):
                 os.makedirs(output_dir)
 
-            for filename in os.listdir(input_dir):
-                if filename.lower().endswith(f".{input_format}"):
-                    input_path = os.path.join(input_dir, filename)
-                    output_filename = os.path.splitext(filename)[0] + f".{output_format}"
-                    output_path = os.path.join(output_dir, output_filename)
-
+            manifest = ConversionManifest(output_dir) if incremental else None
+            if manifest is not None:
+                with os.scandir(output_dir) as entries:
+                    existing_outputs = {entry.name for entry in entries}
+                present = set()
+                source_stats = {}
+
+            jobs = []
+            with os.scandir(input_dir) as entries:
+                for entry in entries:
+                    filename = entry.name
+                    if filename.lower().endswith(f".{input_format}") and entry.is_file():
+                        input_path = os.path.join(input_dir, filename)
+                        output_filename = os.path.splitext(filename)[0] + f".{output_format}"
+                        output_path = os.path.join(output_dir, output_filename)
+                        if manifest is not None:
+                            source = os.path.abspath(input_path)
+                            stat = entry.stat()
+                            present.add(source)
+                            if manifest.is_current(source, stat, os.path.abspath(output_path), output_filename in existing_outputs, use_hash):
+                                summary["skipped"] += 1
+                                continue
+                            source_stats[input_path] = (source, stat)
+                        jobs.append((input_path, output_path))
+
+            for input_path, output_path, error in self._run_conversions(jobs, input_format, output_format, workers):
+                self._record_conversion(summary, input_path, output_path, error)
+                if manifest is not None and error is None:
+                    source, stat = source_stats[input_path]
+                    manifest.record(source, stat, os.path.abspath(output_path), input_format, output_format, use_hash)
+
+            if manifest is not None:
+                for source in manifest.stale_sources(input_dir, input_format, output_format, present):
+                    stale_output = manifest.remove(source)["output"]
                     try:
-                        if input_format == "txt" and output_format == "csv":
-                            with open(input_path, "r") as f:
-                                content = f.read()
-                            with open(output_path, "w") as f:
-                                f.write(content.upper())
-                        elif input_format == "txt" and output_format == "pdf":
-                            with open(input_path, "r") as f:
-                                content = f.read()
-                            pdf = FPDF()
-                            pdf.add_page()
-                            pdf.set_font("Arial", size=12)
-                            pdf.multi_cell(0, 10, content)
-                            pdf.output(output_path)
-                        elif input_format == "csv" and output_format == "xlsx":
-                            df = pd.read_csv(input_path)
-                            df.to_excel(output_path, index=False)
-                        elif input_format == "docx" and output_format == "pdf":
-                            doc = Document(input_path)
-                            pdf = FPDF()
-                            pdf.add_page()
-                            for para in doc.paragraphs:
-                                pdf.set_font("Arial", size=12)
-                                pdf.multi_cell(0, 10, para.text)
-                            pdf.output(output_path)
-                        else:
-                            raise ValueError("Unsupported conversion format")
-
-                        self.logger.info(f"Converted '{input_path}' to '{output_path}'")
-                        self.log_to_mongodb("convert_file", {"input": input_path, "output": output_path}, "Conversion successful")
-
-                    except Exception as e:
-                        self.logger.error(f"Error converting file '{input_path}': {e}")
-                        self.log_to_mongodb("convert_file", {"input": input_path, "output": output_path}, f"Error: {e}", level="ERROR")
-
-            self.logger.info(f"Converted files from '{input_dir}' to '{output_dir}'")
-            self.log_to_mongodb("convert_file", {"input_dir": input_dir, "output_dir": output_dir}, "Conversion successful")
+                        os.remove(stale_output)
+                        self.logger.info(f"Removed '{stale_output}' (source '{source}' no longer exists)")
+                    except FileNotFoundError:
+                        pass
+                    summary["removed"] += 1
+                manifest.save()
+
+            summary["duration"] = round(time.monotonic() - started, 3)
+            self.logger.info(
+                f"Converted files from '{input_dir}' to '{output_dir}': {summary['converted']} converted, "
+                f"{summary['failed']} failed, {summary['skipped']} unchanged, {summary['removed']} removed"
+            )
+            self.log_to_mongodb(
+                "convert_file",
+                {"input_dir": input_dir, "output_dir": output_dir, "workers": workers, **summary},
+                "Conversion successful" if not summary["failed"] else "Conversion completed with errors",
+            )
+            return summary
 
         except Exception as e:
             self.logger.error(f"Error converting files in directory: {e}")
             self.log_to_mongodb("convert_file", {"input_dir": input_dir, "output_dir": output_dir}, f"Error: {e}", level="ERROR")
-    def compress_files(self, directory, output_dir, compression_format):
-        """Compress files in a directory, excluding the output directory."""
+            return None
+
+    def _get_convert_pool(self, workers):
+        """Return the shared conversion process pool, replacing it if a run needs more workers."""
+        with self.convert_pool_lock:
+            if self.convert_pool is None or self.convert_pool_size < workers:
+                if self.convert_pool is not None:
+                    self.convert_pool.shutdown(wait=False)  # runs still using it finish their files
+                # Spawn, not fork: this process runs the log sink, Mongo client and scheduler threads.
+                self.convert_pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+                self.convert_pool_size = workers
+            return self.convert_pool
+
+    def close_convert_pool(self):
+        """Shut down the shared conversion process pool, if one was started."""
+        with self.convert_pool_lock:
+            pool, self.convert_pool, self.convert_pool_size = self.convert_pool, None, 0
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _run_conversions(self, jobs, input_format, output_format, workers):
+        """Convert `(input_path, output_path)` jobs, yielding `(input_path, output_path, error)`."""
+        if workers > 1 and len(jobs) > 1:
+            # The pool is shared and may be larger than this run asked for, so keep at
+            # most `workers` files in flight.
+            pool = self._get_convert_pool(workers)
+            pending = {}
+
+            def collect():
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    input_path, output_path = pending.pop(future)
+                    error = future.exception()
+                    if isinstance(error, BrokenProcessPool):
+                        with self.convert_pool_lock:
+                            if self.convert_pool is pool:
+                                self.convert_pool, self.convert_pool_size = None, 0  # replaced on the next run
+                    yield input_path, output_path, error
+
+            for input_path, output_path in jobs:
+                while len(pending) >= workers:
+                    yield from collect()
+                try:
+                    future = pool.submit(convert, input_path, output_path, input_format, output_format)
+                except RuntimeError:
+                    # Broken, or shut down because another run grew the pool; retry on the current one.
+                    pool = self._get_convert_pool(workers)
+                    try:
+                        future = pool.submit(convert, input_path, output_path, input_format, output_format)
+                    except RuntimeError as e:
+                        yield input_path, output_path, e
+                        continue
+                pending[future] = (input_path, output_path)
+            while pending:
+                yield from collect()
+        else:
+            for input_path, output_path in jobs:
+                try:
+                    convert(input_path, output_path, input_format, output_format)
+                    error = None
+                except Exception as e:
+                    error = e
+                yield input_path, output_path, error
+
+    def _record_conversion(self, summary, input_path, output_path, error):
+        """Log one file's conversion outcome and add it to the run summary."""
+        if error is None:
+            summary["converted"] += 1
+            self.logger.info(f"Converted '{input_path}' to '{output_path}'")
+            self.log_to_mongodb("convert_file", {"input": input_path, "output": output_path}, "Conversion successful")
+        else:
+            summary["failed"] += 1
+            if len(summary["errors"]) < 100:
+                summary["errors"].append({"input": input_path, "error": str(error)})
+            self.logger.error(f"Error converting file '{input_path}': {error}")
+            self.log_to_mongodb("convert_file", {"input": input_path, "output": output_path}, f"Error: {error}", level="ERROR")
+
+    def compress_files(self, directory, output_dir, compression_format, mode="full", workers=None, level=None,
+                       include=None, exclude=None):
+        """Compress files in a directory, excluding the output directory.
+
+        `mode="full"` rebuilds `<dir>.<format>` from scratch. `mode="incremental"`
+        writes a differential archive holding only files added or changed since the
+        previous archive (plus a list of deleted paths); the first incremental run,
+        or one without a base archive, writes the full base archive.
+
+        Zip members are deflated at `level` (stored if unset, as before); with more
+        than one worker they are compressed in parallel threads, at level 6 by default.
+        For tar.gz/tar.bz2/tar.xz `level` is the compressor level. `include` and
+        `exclude` are glob lists matched against relative paths or file names.
+        """
+        workers = workers or self.zip_workers
+        level = level if level is not None else self.zip_compression_level
         try:
             os.makedirs(output_dir, exist_ok=True)
-
-            if compression_format == "zip":
-                output_path = os.path.join(output_dir, os.path.basename(directory) + ".zip")
-                with zipfile.ZipFile(output_path, 'w') as zipf:
-                    for root, _, files in os.walk(directory):
-                        for file in files:
-                            zipf.write(os.path.join(root, file), os.path.relpath(os.path.join(root, file), directory))
-            elif compression_format == "tar":
-                output_path = os.path.join(output_dir, os.path.basename(directory) + ".tar")
-                with tarfile.open(output_path, 'w') as tarf:
-                    for filename in os.listdir(directory):
-                        filepath = os.path.join(directory, filename)
-                        if os.path.isfile(filepath):
-                            tarf.add(filepath, arcname=filename)
+            base_name = os.path.basename(os.path.normpath(directory))
+            state = ArchiveState(output_dir, base_name, compression_format)
+            current = scan_tree(directory, exclude_dirs=[output_dir], include=include, exclude=exclude)
+
+            if mode == "incremental" and state.has_base:
+                changed, deleted = diff_tree(state, current)
+                if not changed and not deleted:
+                    self.logger.info(f"No changes in '{directory}' since the last archive")
+                    self.log_to_mongodb("compress_files", {"directory": directory, "changed": 0}, "No changes to archive")
+                    return {"output": None, "files": 0, "deleted": 0, "bytes": 0}
+                output_path = state.new_delta_path()
+                extra = {DELETED_MEMBER: json.dumps(deleted).encode("utf-8")} if deleted else None
+                write_archive(output_path, compression_format, changed, extra_members=extra, workers=workers, level=level)
+                state.deltas.append(os.path.basename(output_path))
+                summary = {"output": output_path, "files": len(changed), "deleted": len(deleted),
+                           "bytes": sum(size for _, size, _ in changed.values())}
+            elif mode in ("full", "incremental"):
+                output_path = state.base_path
+                write_archive(output_path, compression_format, current, workers=workers, level=level)
+                state.deltas = []
+                summary = {"output": output_path, "files": len(current), "deleted": 0,
+                           "bytes": sum(size for _, size, _ in current.values())}
             else:
-                raise ValueError("Unsupported compression format")
+                raise ValueError(f"Unsupported compression mode '{mode}'")
+
+            state.files = {rel: (size, mtime_ns) for rel, (_, size, mtime_ns) in current.items()}
+            state.save()
+            summary["archive_bytes"] = os.path.getsize(output_path)
 
-            self.logger.info(f"Compressed '{directory}' to '{output_path}'")
-            self.log_to_mongodb("compress_files", {"directory": directory, "output": output_path}, "Compression successful")
+            self.logger.info(f"Compressed '{directory}' to '{output_path}' ({summary['files']} files)")
+            self.log_to_mongodb("compress_files", {"directory": directory, "mode": mode, **summary}, "Compression successful")
+            return summary
         except Exception as e:
             self.logger.error(f"Error compressing files: {e}")
             self.log_to_mongodb("compress_files", {"directory": directory, "output": output_dir}, f"Error: {e}", level="ERROR")
+            return None
+
+    def consolidate_archives(self, directory, output_dir, compression_format):
+        """Merge a base archive and its differential archives into one full archive."""
+        try:
+            base_name = os.path.basename(os.path.normpath(directory))
+            state = ArchiveState(output_dir, base_name, compression_format)
+            if not state.has_base:
+                raise FileNotFoundError(f"No base archive '{state.base_path}' to consolidate")
+            merged_deltas = len(state.deltas)
+            count = consolidate(state)
+            self.logger.info(f"Consolidated {merged_deltas} delta archive(s) into '{state.base_path}' ({count} files)")
+            self.log_to_mongodb("consolidate_archives", {"output": state.base_path, "deltas": merged_deltas, "files": count}, "Archives consolidated")
+            return {"output": state.base_path, "deltas": merged_deltas, "files": count}
+        except Exception as e:
+            self.logger.error(f"Error consolidating archives: {e}")
+            self.log_to_mongodb("consolidate_archives", {"directory": directory, "output": output_dir}, f"Error: {e}", level="ERROR")
+            return None
 
     def add_task(self, interval, unit, task_type, **kwargs):
         """Add a new task to the scheduler."""
-        tasks = self.load_tasks()
         filtered_kwargs = {k: v for k, v in kwargs.items() if v is not None}
         new_task_details = {"interval": interval, "unit": unit, "task_type": task_type, **filtered_kwargs}
 
-        # Check for duplicates based on relevant fields
-        for task_name, existing_task_details in tasks.items():
-            if (
-                existing_task_details["task_type"] == new_task_details["task_type"]
-                and existing_task_details["interval"] == new_task_details["interval"]
-                and existing_task_details["unit"] == new_task_details["unit"]
-                # Add task-specific checks here (example for organize_files):
-                and (
-                    task_type != "organize_files"
-                    or existing_task_details.get("directory") == new_task_details.get("directory")
-                )
-                # Add similar checks for other task types...
-                and (
-                    task_type != "delete_files"
-                    or (existing_task_details.get("directory") == new_task_details.get("directory") and existing_task_details.get("age_days") == new_task_details.get("age_days") and existing_task_details.get("formats") == new_task_details.get("formats"))
-                )
-                and (
-                    task_type != "send_email"
-                    or (existing_task_details.get("recipient_email") == new_task_details.get("recipient_email") and existing_task_details.get("subject") == new_task_details.get("subject") and existing_task_details.get("message") == new_task_details.get("message") and existing_task_details.get("attachments") == new_task_details.get("attachments"))
-                )
-                and (
-                    task_type != "convert_file"
-                    or (existing_task_details.get("input_dir") == new_task_details.get("input_dir") and existing_task_details.get("output_dir") == new_task_details.get("output_dir") and existing_task_details.get("input_format") == new_task_details.get("input_format") and existing_task_details.get("output_format") == new_task_details.get("output_format"))
-                )
-                and (
-                    task_type != "compress_files"
-                    or (existing_task_details.get("directory") == new_task_details.get("directory") and existing_task_details.get("output_dir") == new_task_details.get("output_dir") and existing_task_details.get("compression_format") == new_task_details.get("compression_format"))
-                )
-            ):
-                print(f"Task Exists already {existing_task_details}. Task not added.")
-                return False  # Indicate task was not added (duplicate)
+        # Duplicate detection and name allocation via the store's fingerprint index
+        task_name, added = self.task_store.add(new_task_details)
+        if not added:
+            print(f"Task Exists already {self.task_store.get(task_name)}. Task not added.")
+            return False  # Indicate task was not added (duplicate)
 
-        # Generate a simple task name and handle conflicts
-        counter = 1
-        while True:
-            task_name = f"{task_type}_{counter}"
-            if task_name not in tasks:
-                break
-            counter += 1
-
-        trigger = IntervalTrigger(**{unit: interval})
-
-        if task_type == "organize_files":
-            self.scheduler.add_job(self.organize_files, trigger, args=[filtered_kwargs["directory"]], id=task_name)
-        elif task_type == "delete_files":
-            self.scheduler.add_job(self.delete_files, trigger, args=[filtered_kwargs["directory"], filtered_kwargs["age_days"], filtered_kwargs["formats"]], id=task_name)
-        elif task_type == "send_email":
-            attachments = filtered_kwargs.get("attachments", None)
-            self.scheduler.add_job(self.send_email, trigger, args=[filtered_kwargs["recipient_email"], filtered_kwargs["subject"], filtered_kwargs["message"], attachments], id=task_name)
-        elif task_type == "get_gold_rate":
-            self.scheduler.add_job(self.get_gold_rate, trigger, id=task_name)
-        elif task_type == "convert_file":
-            self.scheduler.add_job(
-                self.convert_file,
-                trigger,
-                args=[
-                    filtered_kwargs["input_dir"],
-                    filtered_kwargs["output_dir"],
-                    filtered_kwargs["input_format"],
-                    filtered_kwargs["output_format"],
-                ],
-                id=task_name,
-            )
-        elif task_type == "compress_files":
-            self.scheduler.add_job(self.compress_files, trigger, args=[filtered_kwargs["directory"], filtered_kwargs["output_dir"], filtered_kwargs["compression_format"]], id=task_name)
-        else:
-            raise ValueError("Unsupported task type")
+        try:
+            self._schedule_task(task_name, new_task_details)
+        except Exception:
+            self.task_store.delete(task_name)
+            raise
 
-        tasks[task_name] = new_task_details
-        self.save_tasks(tasks)
         self.logger.info(f"Added task '{task_name}'")
-        self.log_to_mongodb("add_task", {"task_name": task_name, "details": tasks[task_name]}, "Task added")
+        self.log_to_mongodb("add_task", {"task_name": task_name, "details": new_task_details}, "Task added")
 
         print(f"Task '{task_name}' added successfully.")
-        print(f"Task details: {tasks[task_name]}")
+        print(f"Task details: {new_task_details}")
         return True  # Indicate task was added successfully    
     # def remove_task(self, task_name):
     #     """Remove a task from the scheduler."""
@@ -492,10 +889,9 @@ class TaskManager:
                         self.scheduler._jobstores['default'].remove_job(job.id)
                     
                     # 4. Update task storage
-                    tasks = self.load_tasks()
-                    if task_name in tasks:
-                        del tasks[task_name]
-                        self.save_tasks(tasks)
+                    self.task_store.delete(task_name)
+                    self.watch_tasks.pop(task_name, None)
+                    self._stop_watcher(task_name)
                     
                     self.logger.info(f"Force-removed task '{task_name}'")
                     print(f"Force-removed task '{task_name}'")
@@ -521,25 +917,236 @@ class TaskManager:
                 print(f"- {task_name}: {filtered_details}")
 
     def load_and_schedule_tasks(self):
-        """Load and schedule tasks from the JSON file."""
-        tasks = self.load_tasks()
-        for task_name, details in tasks.items():
-            trigger = IntervalTrigger(**{details["unit"]: details["interval"]})
-            if details["task_type"] == "organize_files":
-                self.scheduler.add_job(self.organize_files, trigger,args=[details["directory"]], id=task_name)
-            elif details["task_type"] == "delete_files":
-                self.scheduler.add_job(self.delete_files, trigger, args=[details["directory"], details["age_days"], details["formats"]], id=task_name)
-            elif details["task_type"] == "send_email":
-                self.scheduler.add_job(self.send_email, trigger, args=[details["recipient_email"], details["subject"], details["message"], details.get("attachments",)], id=task_name)
-            elif details["task_type"] == "get_gold_rate":
-                self.scheduler.add_job(self.get_gold_rate, trigger, id=task_name)
-            elif details["task_type"] == "convert_file":
-                self.scheduler.add_job(self.convert_file, trigger, args=[details["input_dir"], details["output_dir"], details["input_format"], details["output_format"]], id=task_name)
-            elif details["task_type"] == "compress_files":
-                self.scheduler.add_job(self.compress_files, trigger, args=[details["directory"], details["output_dir"], details["compression_format"]], id=task_name)
+        """Load and schedule tasks from the task store."""
+        for task_name, details in self.task_store.all().items():
+            try:
+                self._schedule_task(task_name, details)
+            except Exception as e:
+                self.logger.error(f"Failed to schedule task '{task_name}': {e}")
+
+    def _schedule_task(self, task_name, details):
+        """Register a stored task definition with the scheduler.
+
+        Watch-mode tasks (`trigger: "watch"`) also get an inotify watcher while the
+        scheduler runs; their interval job is the periodic full reconcile.
+        """
+        trigger = IntervalTrigger(**{details["unit"]: details["interval"]})
+        task_type = details["task_type"]
+        if task_type not in TASK_EXECUTORS:
+            raise ValueError("Unsupported task type")
+        executor = details.get("executor") or TASK_EXECUTORS[task_type]
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}', expected one of: {', '.join(EXECUTORS)}")
+        resources = self._task_resources(details)
+        if details.get("trigger", "interval") == "watch":
+            if task_type not in ("organize_files", "delete_files"):
+                raise ValueError("Watch mode is only supported for organize_files and delete_files")
+            self.watch_tasks[task_name] = details
+            if self.scheduler.running:
+                self._start_watcher(task_name)
+        method, args, kwargs = self._job_call(details)
+        self._add_job(task_name, trigger, executor, resources, method, args, kwargs)
+
+    def _job_call(self, details):
+        """Return `(method, args, kwargs)` that run a stored task definition once."""
+        task_type = details["task_type"]
+        if task_type == "organize_files":
+            return (
+                self.organize_files,
+                [details["directory"]],
+                {
+                    "recursive": details.get("recursive", False),
+                    "category_map": details.get("category_map"),
+                    "use_index": details.get("use_index", False),
+                },
+            )
+        if task_type == "delete_files":
+            return (
+                self.delete_files,
+                [details["directory"], details["age_days"], details["formats"]],
+                {
+                    "dry_run": details.get("dry_run", False),
+                    "exclude": details.get("exclude"),
+                    "workers": details.get("workers"),
+                    "use_index": details.get("use_index", False),
+                },
+            )
+        if task_type == "send_email":
+            return (
+                self.send_email,
+                [details["recipient_email"], details["subject"], details["message"], details.get("attachments")],
+                {"workers": details.get("workers"), "rate": details.get("send_rate")},
+            )
+        if task_type == "get_gold_rate":
+            return self.get_gold_rate, [], {}
+        if task_type == "convert_file":
+            return (
+                self.convert_file,
+                [details["input_dir"], details["output_dir"], details["input_format"], details["output_format"]],
+                {"workers": details.get("workers"), "incremental": details.get("incremental", False), "use_hash": details.get("use_hash", False)},
+            )
+        if task_type == "compress_files":
+            return (
+                self.compress_files,
+                [details["directory"], details["output_dir"], details["compression_format"]],
+                {
+                    "mode": details.get("compression_mode", "full"),
+                    "workers": details.get("workers"),
+                    "level": details.get("compression_level"),
+                    "include": details.get("include"),
+                    "exclude": details.get("exclude"),
+                },
+            )
+        raise ValueError("Unsupported task type")
+
+    def _add_job(self, task_name, trigger, executor, resources, method, args=(), kwargs=None):
+        """Schedule `method` on the named executor, gated by `resources` (see _run_job)."""
+        self.scheduler.add_job(
+            self._run_job,
+            trigger,
+            args=[task_name, resources, executor, method.__name__, list(args), kwargs or {}],
+            id=task_name,
+            executor=executor,
+        )
+
+    def _task_resources(self, details):
+        """Return the resource keys a task holds while it runs: its directories plus any listed in "resources"."""
+        paths = [details[field] for field in ("directory", "input_dir", "output_dir") if details.get(field)]
+        paths.extend(details.get("resources") or [])
+        return sorted({resource_key(path) for path in paths})
+
+    def _run_job(self, task_name, resources, executor, method, args, kwargs):
+        """Run one scheduled job once the job gate admits it.
+
+        "cpu" jobs are handed to the worker process pool; bound methods cannot be
+        pickled, so the pool runs run_in_worker with the method name. Runs armed
+        with set_task_profiling are profiled where they execute.
+        """
+        profile = self._take_profiled_run(task_name)
+        if executor != "cpu":
+            run = getattr(self, method)
+            if profile:
+                def run(*args, **kwargs):
+                    return self.run_profiled(task_name, getattr(self, method), args, kwargs)
+        else:
+            def run(*args, **kwargs):
+                with self.cpu_pool_lock:
+                    if self.cpu_pool is None:
+                        self.cpu_pool = ProcessPoolExecutor(self.cpu_workers, mp_context=multiprocessing.get_context("spawn"))
+                    pool = self.cpu_pool
+                try:
+                    return pool.submit(run_in_worker, method, args, kwargs, task_name if profile else None).result()
+                except BrokenProcessPool:
+                    with self.cpu_pool_lock:
+                        if self.cpu_pool is pool:
+                            self.cpu_pool = None  # replaced on the next run
+                    raise
+        scheduled_at = self._scheduled_run_time(task_name)
+        return self._instrumented_run(task_name, method, "interval", resources, scheduled_at, run, *args, **kwargs)
+
+    def set_task_profiling(self, task_name, runs):
+        """Profile the next `runs` scheduled runs of a task (0 switches profiling off).
+
+        The counter is stored in the task definition, so it can be set from the CLI
+        or the web app while the scheduler runs in another process.
+        """
+        with self.task_lock:
+            details = self.task_store.get(task_name)
+            if details is None:
+                self.logger.warning(f"Task '{task_name}' not found")
+                return False
+            details = dict(details)
+            if runs:
+                details["profile_runs"] = int(runs)
+            else:
+                details.pop("profile_runs", None)
+            self.task_store.put(task_name, details)
+        self.logger.info(f"Profiling of '{task_name}' set to the next {runs or 0} run(s); reports go to '{self.profile_dir}'")
+        self.log_to_mongodb("set_task_profiling", {"task_name": task_name, "runs": runs or 0}, "Profiling updated")
+        return True
+
+    def _take_profiled_run(self, task_name):
+        """Consume one armed profiling run of a task; return True if this run is profiled."""
+        details = self.task_store.get(task_name)
+        if not details or not details.get("profile_runs"):
+            return False
+        with self.task_lock:
+            details = dict(self.task_store.get(task_name) or {})
+            if not details.get("profile_runs"):
+                return False
+            details["profile_runs"] -= 1
+            if not details["profile_runs"]:
+                del details["profile_runs"]
+            self.task_store.put(task_name, details)
+        return True
+
+    def run_profiled(self, task_name, func, args=(), kwargs=None):
+        """Call `func` under cProfile/tracemalloc, writing the reports to the profiles directory."""
+        result, report, error = profile_call(func, args, kwargs, self.profile_dir, task_name, self.profile_top)
+        self.logger.info(f"Profiled a run of '{task_name}' ({report['duration']}s, peak {report['peak_memory']} bytes): {report['report']}")
+        self.log_to_mongodb("profile", {"task_name": task_name, **report}, "Profile written")
+        if error is not None:
+            raise error
+        return result
+
+    def profile_task(self, task_name):
+        """Run a stored task once in the foreground under the profiler; return the report paths."""
+        details = self.task_store.get(task_name)
+        if details is None:
+            self.logger.warning(f"Task '{task_name}' not found")
+            print(f"Task '{task_name}' not found")
+            return None
+        method, args, kwargs = self._job_call(details)
+        result, report, error = profile_call(method, args, kwargs, self.profile_dir, task_name, self.profile_top)
+        self.log_to_mongodb("profile", {"task_name": task_name, **report}, "Profile written" if error is None else f"Error: {error}")
+        if error is not None:
+            self.logger.error(f"Profiled run of '{task_name}' failed: {error}")
+        print(f"Profiled '{task_name}' in {report['duration']}s (peak traced memory {report['peak_memory']} bytes)")
+        if report["pstats"]:
+            print(f"  stats:  {report['pstats']}")
+        print(f"  report: {report['report']}")
+        return report
+
+    def _scheduled_run_time(self, task_name):
+        """Return the Unix time the current run of an interval job was due (its latest fire time)."""
+        job = self.scheduler.get_job(task_name)
+        trigger = job.trigger if job else None
+        if not isinstance(trigger, IntervalTrigger):
+            return None
+        start = trigger.start_date.timestamp()
+        now = time.time()
+        if now < start:
+            return None
+        return start + (now - start) // trigger.interval_length * trigger.interval_length
+
+    def _instrumented_run(self, task_name, task_type, trigger, resources, scheduled_at, run, *args, **kwargs):
+        """Run a job through the job gate and record its duration, lag, outcome and work done."""
+        with self.job_gate.hold(task_name, resources) as wait:
+            if wait >= self.queue_lag_warning:
+                self.logger.warning(f"Task '{task_name}' waited {wait:.1f}s in the job queue")
+            started = time.monotonic()
+            lag = time.time() - scheduled_at if scheduled_at is not None else None
+            result = None
+            outcome = "error"
+            try:
+                result = run(*args, **kwargs)
+                if isinstance(result, dict) and result.get("failed"):
+                    outcome = "partial"
+                elif result is not None and result is not False:
+                    outcome = "success"
+                return result
+            finally:
+                items = {}
+                if isinstance(result, dict):
+                    items = {item: result.get(field) for field, item in RUN_ITEMS.get(task_type, {}).items()}
+                self.metrics.record_run(task_name, task_type, trigger, outcome, time.monotonic() - started,
+                                        lag=lag, wait=wait, items=items)
 
     def start_scheduler(self):
-        """Start the scheduler."""
+        """Start the scheduler (not in worker instances, which only run handed-over jobs)."""
+        if self.worker:
+            self.logger.warning("Not starting the scheduler in a worker process")
+            return
         self.scheduler.start()
         try:
             while True:
@@ -549,6 +1156,28 @@ class TaskManager:
             self.scheduler.shutdown()
 
 
+_worker_manager = None
+
+
+def run_in_worker(method, args, kwargs, profile_task=None):
+    """Run a TaskManager method inside a "cpu" executor process.
+
+    Each worker process builds its own TaskManager on first use and keeps it for
+    later runs; its MongoDB log buffer is flushed when the pool shuts the process
+    down (pool processes skip atexit handlers, hence multiprocessing's Finalize).
+    With `profile_task` the run is profiled under that task's name.
+    """
+    global _worker_manager
+    if _worker_manager is None:
+        _worker_manager = TaskManager(worker=True)
+        multiprocessing.util.Finalize(_worker_manager, _worker_manager.log_sink.close, exitpriority=10)
+        multiprocessing.util.Finalize(_worker_manager, _worker_manager.close_convert_pool, exitpriority=20)
+    func = getattr(_worker_manager, method)
+    if profile_task:
+        return _worker_manager.run_profiled(profile_task, func, args, kwargs)
+    return func(*args, **kwargs)
+
+
 # CLI Interface
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Python-Task Manager CLI", formatter_class=argparse.RawTextHelpFormatter)
@@ -596,37 +1225,84 @@ For more details on each commands, use the -h option with the subcommand.
     add_parser.add_argument("--subject", type=str, help=argparse.SUPPRESS)
     add_parser.add_argument("--message", type=str, help=argparse.SUPPRESS)
     add_parser.add_argument("--attachments", nargs="*", help=argparse.SUPPRESS)
+    add_parser.add_argument("--workers", type=int, help=argparse.SUPPRESS)
+    add_parser.add_argument("--send-rate", type=float, help=argparse.SUPPRESS)
+    add_parser.add_argument("--incremental", action="store_true", default=None, help=argparse.SUPPRESS)
+    add_parser.add_argument("--use-hash", action="store_true", default=None, help=argparse.SUPPRESS)
     add_parser.add_argument("--input-dir", type=str, help=argparse.SUPPRESS)
     add_parser.add_argument("--output-dir", type=str, help=argparse.SUPPRESS)
-    add_parser.add_argument("--input-format", type=str, help=argparse.SUPPRESS)
-    add_parser.add_argument("--output-format", type=str, help=argparse.SUPPRESS)
-    add_parser.add_argument("--compression-format", type=str, choices=["zip", "tar"], help=argparse.SUPPRESS)
+    add_parser.add_argument("--input-format", type=str, choices=input_formats(), help=argparse.SUPPRESS)
+    add_parser.add_argument("--output-format", type=str, choices=output_formats(), help=argparse.SUPPRESS)
+    add_parser.add_argument("--compression-format", type=str, choices=COMPRESSION_FORMATS, help=argparse.SUPPRESS)
+    add_parser.add_argument("--compression-mode", type=str, choices=["full", "incremental"], help=argparse.SUPPRESS)
+    add_parser.add_argument("--use-index", action="store_true", default=None, help=argparse.SUPPRESS)
+    add_parser.add_argument("--trigger", type=str, choices=["interval", "watch"], help=argparse.SUPPRESS)
+    add_parser.add_argument("--dry-run", action="store_true", default=None, help=argparse.SUPPRESS)
+    add_parser.add_argument("--recursive", action="store_true", default=None, help=argparse.SUPPRESS)
+    add_parser.add_argument("--category-map", type=str, help=argparse.SUPPRESS)
+    add_parser.add_argument("--compression-level", type=int, choices=range(0, 10), help=argparse.SUPPRESS)
+    add_parser.add_argument("--include", type=str, nargs="+", help=argparse.SUPPRESS)
+    add_parser.add_argument("--exclude", type=str, nargs="+", help=argparse.SUPPRESS)
+    add_parser.add_argument("--executor", type=str, choices=EXECUTORS, help=argparse.SUPPRESS)
+    add_parser.add_argument("--resources", type=str, nargs="+", help=argparse.SUPPRESS)
     add_parser.epilog = """
 Available tasks:
 
     organize_files: Organize files in a directory.
                     Organization: Files are categorized into folders based on their extensions:
                     [Images, Videos, Documents, Audio, Archives, Executables, Code, Data, Others.]
+                    --recursive also gathers files from subdirectories; --category-map takes a
+                    JSON file of {"Folder": [".ext", ...]} to use instead of the default categories.
+
+    --use-index (organize_files, delete_files): take candidates from a persistent per-directory
+                    index refreshed via directory mtimes, so unchanged subtrees are not re-listed.
+                    Files edited in place are only seen after `index --full`.
+
+    --trigger watch (organize_files, delete_files): react to files created or moved into the
+                    directory (Linux inotify) instead of waiting for the next tick; the interval
+                    then only sets how often a full reconcile pass runs.
+
+    --executor io|cpu: scheduler pool the task runs on. By default convert_file and
+                    compress_files run in worker processes (CPU_WORKERS) and the other tasks
+                    in threads (IO_WORKERS), so a long conversion cannot starve email sends.
+
+    --resources: extra directories the task touches. Runs of tasks sharing a directory
+                    (their --directory/--input-dir/--output-dir or --resources, including
+                    nested paths) never overlap, at most MAX_CONCURRENT_JOBS runs go at once,
+                    and a run still going when the next is due absorbs it instead of overlapping.
 
     delete_files: Delete files older than a specified age.
+                  Subtrees are scanned in parallel; --exclude skips directories matching a glob
+                  (e.g. --exclude .git node_modules) and --dry-run only reports what would go.
 
     send_email: Send an email.
+                Recipients are sent concurrently; tune with --workers (parallel sends)
+                and --send-rate (max messages per second).
     
     get_gold_rate: Scrape and store 22K gold rates in India.
+                   Samples are appended to gold_rates.csv (GOLD_RATE_HISTORY); use the
+                   export-gold-rates command to produce an Excel workbook and
+                   gold-stats (or GET /api/gold_rates/<query>) for OHLC, rolling means
+                   and percent changes.
 
     convert_file: Convert files in a directory. Supported conversions:
-        - txt to csv
-        - txt to pdf
-        - csv to xlsx
-        - docx to pdf
+""" + "\n".join(f"        - {i} to {o}" for i, o in supported_conversions()) + """
+        Use --workers N to convert files in parallel across N processes.
+        Use --incremental to skip files unchanged since the last run (add --use-hash
+        to compare content when only the mtime changed) and to remove outputs of deleted files.
         
     compress_files: Compress files in a directory.
-                    Compression Format [ZIP/TAR]  
+                    Compression Format [ZIP/TAR/TAR.GZ/TAR.BZ2/TAR.XZ]  
+                    --compression-mode incremental archives only files changed since the last
+                    archive (deletions are recorded); merge them with the consolidate command.
+                    --compression-level 0-9 deflates zip members (default: stored) or sets the
+                    tar.gz/tar.bz2/tar.xz level; --workers N compresses zip members in N threads.
+                    --include/--exclude take glob patterns (e.g. --exclude '*.tmp' .git).
 
 Example usage:
 
     organize_files: 
-                    python task_manager.py add --interval 1 --unit days --task-type organize_files --directory '/path/to/directory'
+                    python task_manager.py add --interval 1 --unit days --task-type organize_files --directory '/path/to/directory' [--trigger watch]
 
     delete_files: 
                     python task_manager.py add --interval 1 --unit days --task-type delete_files --directory '/path/to/directory' --age-days 30 --formats .txt .log
@@ -641,7 +1317,7 @@ Example usage:
                     python task_manager.py add --interval 1 --unit days --task-type convert_file --input-dir '/path/to/input' --output-dir '/path/to/output' --input-format txt --output-format pdf
 
     compress_files: 
-                    python task_manager.py add --interval 1 --unit days --task-type compress_files --directory '/path/to/directory' --output-dir '/path/to/output' --compression-format zip
+                    python task_manager.py add --interval 1 --unit days --task-type compress_files --directory '/path/to/directory' --output-dir '/path/to/output' --compression-format zip [--compression-mode incremental]
 """
 
     # Remove Task Parser
@@ -661,6 +1337,113 @@ Example usage:
     python task_manager.py list
 """
 
+    # Consolidate Archives Parser
+    consolidate_parser = subparsers.add_parser("consolidate", help="Merge incremental archives into a full archive", formatter_class=argparse.RawTextHelpFormatter)
+    consolidate_parser.add_argument("--directory", type=str, required=True, help="Directory the archives were made from")
+    consolidate_parser.add_argument("--output-dir", type=str, required=True, help="Directory holding the archives")
+    consolidate_parser.add_argument("--compression-format", type=str, choices=COMPRESSION_FORMATS, required=True, help="Archive format")
+    consolidate_parser.epilog = """
+Example usage:
+    
+    python task_manager.py consolidate --directory '/path/to/directory' --output-dir '/path/to/output' --compression-format zip
+"""
+
+    # Export Gold Rates Parser
+    export_parser = subparsers.add_parser("export-gold-rates", help="Export the gold price history to Excel", formatter_class=argparse.RawTextHelpFormatter)
+    export_parser.add_argument("--output", type=str, default="gold_rates.xlsx", help="Excel file to write (default: gold_rates.xlsx)")
+    export_parser.epilog = """
+Example usage:
+    
+    python task_manager.py export-gold-rates --output gold_rates.xlsx
+"""
+
+    # Gold Rate Analytics Parser
+    stats_parser = subparsers.add_parser("gold-stats", help="Analyse the gold price history", formatter_class=argparse.RawTextHelpFormatter)
+    stats_parser.add_argument("--query", type=str, choices=GOLD_RATE_QUERIES, default="summary", help="ohlc, rolling, pct-change or summary (default: summary)")
+    stats_parser.add_argument("--window", type=str, help="Resample rule or rolling window, e.g. 1D, 1W, 7D or a row count (rolling only)")
+    stats_parser.add_argument("--periods", type=int, default=1, help="Samples to compare over for pct-change (default: 1)")
+    stats_parser.add_argument("--start", type=str, help="Only use samples from this date/time on")
+    stats_parser.add_argument("--end", type=str, help="Only use samples up to this date/time")
+    stats_parser.epilog = """
+Example usage:
+    
+    python task_manager.py gold-stats
+    python task_manager.py gold-stats --query ohlc --window 1W --start 2024-01-01
+    python task_manager.py gold-stats --query rolling --window 30D
+    python task_manager.py gold-stats --query pct-change --window 1D
+"""
+
+    # Profile Parser
+    profile_parser = subparsers.add_parser("profile", help="Profile a task now or arm profiling of its next runs", formatter_class=argparse.RawTextHelpFormatter)
+    profile_parser.add_argument("--task-name", type=str, required=True, help="Name of the task to profile")
+    profile_parser.add_argument("--runs", type=int, help="Profile the next N scheduled runs instead of running it now (0 = off)")
+    profile_parser.epilog = """
+Runs the task once in the foreground under cProfile and tracemalloc, or with --runs N
+profiles its next N scheduled runs. Reports (.pstats and a .txt summary of the slowest
+functions and largest allocation sites) are written to the PROFILE_DIR directory.
+
+Example usage:
+    
+    python task_manager.py profile --task-name compress_files_1
+    python task_manager.py profile --task-name organize_files_1 --runs 3
+"""
+
+    # Directory Index Parser
+    index_parser = subparsers.add_parser("index", help="Refresh or query the persistent directory index", formatter_class=argparse.RawTextHelpFormatter)
+    index_parser.add_argument("--directory", type=str, required=True, help="Root directory of the index")
+    index_parser.add_argument("--full", action="store_true", help="Re-stat every file (picks up in-place edits)")
+    index_parser.add_argument("--no-refresh", action="store_true", help="Query the index as it is")
+    index_parser.add_argument("--changed-since", type=int, help="List files changed after this refresh sequence")
+    index_parser.add_argument("--older-than", type=float, help="List files older than this many days")
+    index_parser.add_argument("--formats", type=str, nargs="+", help="Limit listings to these extensions")
+    index_parser.epilog = """
+Example usage:
+    
+    python task_manager.py index --directory '/path/to/directory'
+    python task_manager.py index --directory '/path/to/directory' --older-than 30 --formats .log .tmp
+    python task_manager.py index --directory '/path/to/directory' --changed-since 12
+"""
+
+    # Zip Benchmark Parser
+    benchmark_parser = subparsers.add_parser("benchmark-zip", help="Compare serial and parallel zip throughput", formatter_class=argparse.RawTextHelpFormatter)
+    benchmark_parser.add_argument("--directory", type=str, required=True, help="Directory to compress")
+    benchmark_parser.add_argument("--workers", type=int, help="Compression threads (default: CPU count)")
+    benchmark_parser.add_argument("--compression-level", type=int, choices=range(0, 10), default=6, help="Deflate level (default: 6)")
+    benchmark_parser.add_argument("--repeat", type=int, default=1, help="Runs per variant; the best time is reported")
+    benchmark_parser.epilog = """
+Example usage:
+    
+    python task_manager.py benchmark-zip --directory '/path/to/directory' --workers 4
+"""
+
+    # Benchmark Suite Parser
+    bench_parser = subparsers.add_parser("bench", help="Benchmark every task type against local stand-ins", formatter_class=argparse.RawTextHelpFormatter)
+    bench_parser.add_argument("--tasks", type=str, nargs="+", choices=list(TASK_EXECUTORS), help="Task types to run (default: all)")
+    bench_parser.add_argument("--files", type=int, default=1000, help="Files in the synthetic tree (default: 1000)")
+    bench_parser.add_argument("--dirs", type=int, default=10, help="Directories the files are spread over (default: 10)")
+    bench_parser.add_argument("--file-size", type=int, default=4096, help="Bytes per synthetic file (default: 4096)")
+    bench_parser.add_argument("--convert-files", type=int, default=20, help="CSV files converted to XLSX (default: 20)")
+    bench_parser.add_argument("--recipients", type=int, default=500, help="Recipients in the synthetic mailing list (default: 500)")
+    bench_parser.add_argument("--fetches", type=int, default=50, help="Gold rate page fetches per run (default: 50)")
+    bench_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per task (default: 3)")
+    bench_parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic data (default: 0)")
+    bench_parser.add_argument("--compression-format", type=str, choices=COMPRESSION_FORMATS, default="zip", help="Archive format for compress_files (default: zip)")
+    bench_parser.add_argument("--compression-level", type=int, choices=range(0, 10), help="Compression level for compress_files")
+    bench_parser.add_argument("--work-dir", type=str, help="Keep the synthetic data here instead of a temporary directory")
+    bench_parser.add_argument("--output", type=str, help="Also write the JSON report to this file")
+    bench_parser.add_argument("--baseline", type=str, help="JSON report of an earlier run to compare against")
+    bench_parser.epilog = """
+Runs organize_files, delete_files, convert_file, compress_files, send_email and get_gold_rate
+on regenerated synthetic data against a local SMTP sink, a local HTTP server serving a gold
+rate page and an in-memory Mongo collection, and prints throughput, run-time percentiles and
+peak traced memory per task as JSON (with the git commit, for comparing across commits).
+
+Example usage:
+    
+    python task_manager.py bench --output bench-before.json
+    python task_manager.py bench --tasks organize_files delete_files --files 20000 --baseline bench-before.json
+"""
+
     # Start Scheduler Parser
     start_parser = subparsers.add_parser("start", help="Start the scheduler", formatter_class=argparse.RawTextHelpFormatter)
     start_parser.epilog = """
@@ -691,16 +1474,81 @@ Example usage:
             subject=args.subject,
             message=args.message,
             attachments=args.attachments,
+            workers=args.workers,
+            send_rate=args.send_rate,
+            incremental=args.incremental,
+            use_hash=args.use_hash,
             input_dir=args.input_dir,
             output_dir=args.output_dir,
             input_format=args.input_format,
             output_format=args.output_format,
             compression_format=args.compression_format,
+            compression_mode=args.compression_mode,
+            compression_level=args.compression_level,
+            recursive=args.recursive,
+            dry_run=args.dry_run,
+            trigger=args.trigger,
+            use_index=args.use_index,
+            category_map=args.category_map,
+            include=args.include,
+            exclude=args.exclude,
+            executor=args.executor,
+            resources=args.resources,
         )
     elif args.command == "remove":
         manager.remove_task(args.task_name)
     elif args.command == "list":
         manager.list_tasks()
+    elif args.command == "consolidate":
+        manager.consolidate_archives(args.directory, args.output_dir, args.compression_format)
+    elif args.command == "export-gold-rates":
+        manager.export_gold_rates(args.output)
+    elif args.command == "gold-stats":
+        try:
+            print(json.dumps(manager.gold_rate_analytics(args.query, args.window, args.periods, args.start, args.end), indent=2))
+        except ValueError as e:
+            manager.logger.error(f"Invalid gold-stats query: {e}")
+    elif args.command == "profile":
+        if args.runs is None:
+            manager.profile_task(args.task_name)
+        elif manager.set_task_profiling(args.task_name, args.runs):
+            print(f"Profiling the next {args.runs} run(s) of '{args.task_name}'.")
+        else:
+            print(f"Task '{args.task_name}' not found")
+    elif args.command == "index":
+        index = manager.get_dir_index(args.directory)
+        result = {} if args.no_refresh else {"refresh": index.refresh(full=args.full)}
+        result["index"] = index.stats()
+        if args.changed_since is not None:
+            result["changed"] = [path for path, _, _ in index.changed_since(args.changed_since, args.formats)]
+        if args.older_than is not None:
+            result["older"] = [path for path, _, _ in index.older_than(time.time() - args.older_than * 86400, args.formats)]
+        print(json.dumps(result, indent=2))
+    elif args.command == "benchmark-zip":
+        print(json.dumps(benchmark_zip(args.directory, workers=args.workers, level=args.compression_level, repeat=args.repeat), indent=2))
+    elif args.command == "bench":
+        from bench import compare as compare_bench, run_benchmarks  # imported on demand: only the bench command needs it
+        report = run_benchmarks(
+            tasks=args.tasks,
+            files=args.files,
+            dirs=args.dirs,
+            file_size=args.file_size,
+            convert_files=args.convert_files,
+            recipients=args.recipients,
+            fetches=args.fetches,
+            repeat=args.repeat,
+            seed=args.seed,
+            compression_format=args.compression_format,
+            compression_level=args.compression_level,
+            work_dir=args.work_dir,
+        )
+        if args.baseline:
+            with open(args.baseline, "r") as f:
+                compare_bench(report, json.load(f))
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        print(json.dumps(report, indent=2))
     elif args.command == "start":
         manager.start_scheduler()
     else:
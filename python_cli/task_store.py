@@ -0,0 +1,369 @@
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+# Fields that identify what a task does, per task type. Two tasks of the same
+# type, interval and unit with equal (normalized) identity fields are duplicates.
+# Task types not listed here are identified by all of their parameters.
+IDENTITY_FIELDS = {
+    "organize_files": ("directory", "recursive", "category_map", "trigger", "use_index"),
+    "delete_files": ("directory", "age_days", "formats", "exclude", "dry_run", "trigger", "use_index"),
+    "send_email": ("recipient_email", "subject", "message", "attachments"),
+    "get_gold_rate": (),
+    "convert_file": ("input_dir", "output_dir", "input_format", "output_format", "incremental", "use_hash"),
+    "compress_files": ("directory", "output_dir", "compression_format", "compression_mode", "compression_level", "include", "exclude"),
+}
+
+SCHEDULE_FIELDS = ("task_type", "interval", "unit")
+
+
+def _normalize_path(value):
+    return os.path.normcase(os.path.realpath(os.path.expanduser(str(value))))
+
+
+def _normalize_extension(value):
+    value = str(value).strip().lower()
+    return value if value.startswith(".") else f".{value}"
+
+
+def _normalize_format(value):
+    return str(value).strip().lower().lstrip(".")
+
+
+def _normalize_recipients(value):
+    if isinstance(value, str) and not value.endswith((".csv", ".xlsx")):
+        value = value.split(",")
+    if isinstance(value, (list, tuple)):
+        return sorted({str(email).strip().lower() for email in value if str(email).strip()})
+    return _normalize_path(value)
+
+
+FIELD_NORMALIZERS = {
+    "directory": _normalize_path,
+    "input_dir": _normalize_path,
+    "output_dir": _normalize_path,
+    "formats": lambda value: sorted({_normalize_extension(v) for v in value or []}),
+    "attachments": lambda value: sorted(_normalize_path(v) for v in value or []),
+    "recipient_email": _normalize_recipients,
+    "input_format": _normalize_format,
+    "output_format": _normalize_format,
+    "compression_format": _normalize_format,
+    "category_map": _normalize_path,
+    "trigger": lambda value: None if value == "interval" else value,
+    "compression_mode": lambda value: None if value == "full" else value,
+    "incremental": lambda value: value or None,
+    "use_hash": lambda value: value or None,
+    "include": lambda value: sorted(set(value)) if value else None,
+    "exclude": lambda value: sorted(set(value)) if value else None,
+}
+
+
+def task_fingerprint(task):
+    """Return a stable hash of a task's schedule and normalized identity parameters."""
+    task_type = task.get("task_type")
+    fields = IDENTITY_FIELDS.get(task_type)
+    if fields is None:
+        fields = sorted(k for k in task if k not in SCHEDULE_FIELDS)
+
+    canonical = {k: task.get(k) for k in SCHEDULE_FIELDS}
+    for field in fields:
+        value = task.get(field)
+        if value is not None and field in FIELD_NORMALIZERS:
+            value = FIELD_NORMALIZERS[field](value)
+        canonical[field] = value
+    payload = json.dumps(canonical, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _name_counter(name, task_type):
+    prefix, _, suffix = name.rpartition("_")
+    if prefix == task_type and suffix.isdigit():
+        return int(suffix)
+    return 0
+
+
+class TaskStore:
+    """Cached, journaled storage for scheduled task definitions.
+
+    The task table lives in a JSON snapshot (`scheduled_tasks.json`, same format
+    as before) plus an append-only journal of `put`/`delete` records next to it.
+    Each change appends one fsync'ed line to the journal instead of rewriting the
+    whole file; the snapshot is rewritten atomically (temp file + os.replace) only
+    when the journal is compacted.
+
+    Reads are served from an in-memory cache. The cache is revalidated against the
+    snapshot and journal file signatures (mtime, size) so changes made by another
+    process (e.g. the CLI while the web dashboard runs) are picked up, and only the
+    new tail of the journal is replayed when the snapshot has not changed.
+
+    Alongside the cache, the store keeps a fingerprint -> task name index and the
+    highest `<task_type>_<n>` counter per task type, so duplicate detection and
+    name allocation in `add` do not scan the task table. Counters only move
+    forward: compaction starts the new journal with a `counters` record, so the
+    name of a deleted task is not handed out again.
+    """
+
+    def __init__(self, path, compact_threshold=1000):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.lock_path = f"{path}.lock"
+        self.compact_threshold = compact_threshold
+        self.version = 0
+
+        self._lock = threading.RLock()
+        self._tasks = {}
+        self._fingerprints = {}
+        self._counters = {}
+        self._snapshot_sig = None
+        self._journal_sig = None
+        self._journal_offset = 0
+        self._journal_records = 0
+
+    # -- public API -------------------------------------------------------
+
+    def all(self):
+        """Return a shallow copy of all tasks keyed by task name."""
+        with self._lock:
+            self._refresh()
+            return dict(self._tasks)
+
+    def get(self, name):
+        """Return a single task definition or None."""
+        with self._lock:
+            self._refresh()
+            return self._tasks.get(name)
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._tasks)
+
+    def find_duplicate(self, task):
+        """Return the name of an existing task with the same fingerprint, or None."""
+        with self._lock:
+            self._refresh()
+            return self._fingerprints.get(task_fingerprint(task))
+
+    def next_name(self, task_type):
+        """Return the next unused `<task_type>_<n>` name."""
+        with self._lock:
+            self._refresh()
+            return f"{task_type}_{self._counters.get(task_type, 0) + 1}"
+
+    def add(self, task):
+        """Store a new task under a generated name unless a duplicate exists.
+
+        Returns `(task_name, True)` when added, or `(existing_name, False)` when a
+        task with the same fingerprint is already stored.
+        """
+        with self._lock, self._file_lock():
+            self._refresh()
+            existing = self._fingerprints.get(task_fingerprint(task))
+            if existing is not None:
+                return existing, False
+            name = f"{task['task_type']}_{self._counters.get(task['task_type'], 0) + 1}"
+            self._append({"op": "put", "name": name, "task": task})
+            self._apply_put(name, task)
+            self._after_write()
+            return name, True
+
+    def put(self, name, task):
+        """Insert or replace a task definition durably."""
+        with self._lock, self._file_lock():
+            self._refresh()
+            self._append({"op": "put", "name": name, "task": task})
+            self._apply_put(name, task)
+            self._after_write()
+
+    def delete(self, name):
+        """Remove a task definition. Returns False if it did not exist."""
+        with self._lock, self._file_lock():
+            self._refresh()
+            if name not in self._tasks:
+                return False
+            self._append({"op": "delete", "name": name})
+            self._apply_delete(name)
+            self._after_write()
+            return True
+
+    def replace_all(self, tasks):
+        """Replace the whole task table with an atomic snapshot rewrite."""
+        with self._lock, self._file_lock():
+            self._refresh()
+            counters = self._counters
+            self._reset(dict(tasks))
+            self._apply_counters(counters)
+            self._write_snapshot()
+            self.version += 1
+
+    def compact(self):
+        """Fold the journal into the snapshot and truncate the journal."""
+        with self._lock, self._file_lock():
+            self._refresh()
+            self._write_snapshot()
+
+    # -- cache and index maintenance ---------------------------------------
+
+    def _reset(self, tasks):
+        self._tasks = {}
+        self._fingerprints = {}
+        self._counters = {}
+        for name, task in tasks.items():
+            self._apply_put(name, task)
+
+    def _apply_put(self, name, task):
+        previous = self._tasks.get(name)
+        if previous is not None:
+            self._unindex(name, previous)
+        self._tasks[name] = task
+        self._fingerprints[task_fingerprint(task)] = name
+        task_type = task.get("task_type")
+        counter = _name_counter(name, task_type)
+        if counter > self._counters.get(task_type, 0):
+            self._counters[task_type] = counter
+
+    def _apply_counters(self, counters):
+        for task_type, counter in counters.items():
+            if counter > self._counters.get(task_type, 0):
+                self._counters[task_type] = counter
+
+    def _apply_delete(self, name):
+        task = self._tasks.pop(name, None)
+        if task is not None:
+            self._unindex(name, task)
+
+    def _unindex(self, name, task):
+        fingerprint = task_fingerprint(task)
+        if self._fingerprints.get(fingerprint) == name:
+            del self._fingerprints[fingerprint]
+
+    # -- internals ----------------------------------------------------------
+
+    @contextmanager
+    def _file_lock(self):
+        """Serialize writers across processes where flock is available."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _signature(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _refresh(self):
+        snapshot_sig = self._signature(self.path)
+        journal_sig = self._signature(self.journal_path)
+        if snapshot_sig == self._snapshot_sig and journal_sig == self._journal_sig:
+            return
+
+        journal_size = journal_sig[1] if journal_sig else 0
+        if snapshot_sig != self._snapshot_sig or journal_size < self._journal_offset:
+            self._reset(self._read_snapshot())
+            self._journal_offset = 0
+            self._journal_records = 0
+
+        self._replay_journal()
+        self._snapshot_sig = snapshot_sig
+        self._journal_sig = self._signature(self.journal_path)
+        self.version += 1
+
+    def _read_snapshot(self):
+        try:
+            with open(self.path, "r") as f:
+                tasks = json.load(f)
+                return tasks if isinstance(tasks, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _replay_journal(self):
+        try:
+            f = open(self.journal_path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(self._journal_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Torn write from a crash mid-append; ignore until it is completed or compacted away.
+                    break
+                self._journal_offset += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("op") == "put":
+                    self._apply_put(record["name"], record["task"])
+                elif record.get("op") == "delete":
+                    self._apply_delete(record["name"])
+                elif record.get("op") == "counters":
+                    self._apply_counters(record["counters"])
+                    continue
+                self._journal_records += 1
+
+    def _append(self, record):
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        with open(self.journal_path, "ab") as f:
+            if f.tell() > self._journal_offset:
+                # Drop a torn record left behind by a crash so it cannot swallow this one.
+                f.truncate(self._journal_offset)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_offset += len(line)
+        self._journal_records += 1
+
+    def _after_write(self):
+        self.version += 1
+        if self._journal_records >= self.compact_threshold:
+            self._write_snapshot()
+        else:
+            self._snapshot_sig = self._signature(self.path)
+            self._journal_sig = self._signature(self.journal_path)
+
+    def _write_snapshot(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._tasks, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        # The snapshot now contains every journaled change; replaying the journal
+        # again after a crash before truncation is harmless because records are idempotent.
+        # The new journal starts with the name counters, which the snapshot cannot carry.
+        counters = (json.dumps({"op": "counters", "counters": self._counters}, separators=(",", ":")) + "\n").encode("utf-8")
+        with open(self.journal_path, "wb") as f:
+            f.write(counters)
+            f.flush()
+            os.fsync(f.fileno())
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        self._journal_offset = len(counters)
+        self._journal_records = 0
+        self._snapshot_sig = self._signature(self.path)
+        self._journal_sig = self._signature(self.journal_path)
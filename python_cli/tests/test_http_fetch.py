@@ -0,0 +1,61 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench import GoldRateServer
+from gold_rate import extract_gold_price
+from http_fetch import HttpFetcher
+
+
+class HttpFetcherTest(unittest.TestCase):
+    """Conditional fetches against the local gold-rate server used by the benchmarks."""
+
+    def start_server(self, **kwargs):
+        server = GoldRateServer(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def make_fetcher(self):
+        fetcher = HttpFetcher(timeout=5)
+        self.addCleanup(fetcher.close)
+        return fetcher
+
+    def test_not_modified_keeps_cached_validators(self):
+        server = self.start_server(changing=False)
+        fetcher = self.make_fetcher()
+
+        first = fetcher.fetch(server.url, extract=extract_gold_price)
+        self.assertEqual((first.status, first.changed), (200, True))
+        validators = dict(fetcher._validators[server.url])
+        self.assertEqual(validators["etag"], '"6000"')
+        self.assertEqual(validators["last_modified"], server.last_modified)
+
+        for _ in range(2):
+            result = fetcher.fetch(server.url, extract=extract_gold_price)
+            self.assertEqual((result.status, result.changed, result.value), (304, False, first.value))
+            self.assertEqual(fetcher._validators[server.url], validators)
+
+        self.assertEqual(server.conditional_headers, [
+            (None, None),
+            ('"6000"', server.last_modified),
+            ('"6000"', server.last_modified),
+        ])
+        self.assertEqual(fetcher.counters, {"requests": 3, "not_modified": 2, "unchanged": 0, "parsed": 1})
+
+    def test_changed_page_is_parsed_again(self):
+        server = self.start_server()
+        fetcher = self.make_fetcher()
+        first = fetcher.fetch(server.url, extract=extract_gold_price)
+        second = fetcher.fetch(server.url, extract=extract_gold_price)
+        self.assertEqual((second.status, second.changed), (200, True))
+        self.assertNotEqual(first.value, second.value)
+        self.assertEqual(fetcher._validators[server.url]["etag"], '"6002"')
+
+
+if __name__ == "__main__":
+    unittest.main()
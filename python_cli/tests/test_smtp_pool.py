@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench import SMTPSink
+from smtp_pool import SMTPPool
+
+
+class _Body:
+    """Attachment-like segment streamed through `chunks()`."""
+
+    def __init__(self, *chunks):
+        self._chunks = chunks
+
+    def chunks(self):
+        return iter(self._chunks)
+
+
+class SMTPPoolTest(unittest.TestCase):
+    """SMTPPool against the local SMTP sink used by the benchmarks."""
+
+    def start_sink(self, **kwargs):
+        sink = SMTPSink(**kwargs)
+        threading.Thread(target=sink.serve_forever, daemon=True).start()
+        self.addCleanup(sink.server_close)
+        self.addCleanup(sink.shutdown)
+        return sink
+
+    def make_pool(self, sink, **kwargs):
+        pool = SMTPPool("127.0.0.1", sink.server_address[1], use_starttls=False, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_sessions_are_reused(self):
+        sink = self.start_sink()
+        pool = self.make_pool(sink, max_size=1)
+        for i in range(3):
+            pool.send_segments("from@example.com", ["to@example.com"], [f"Subject: {i}\r\n\r\nbody\r\n".encode()])
+        stats = pool.stats()
+        self.assertEqual((stats["opened"], stats["reused"], stats["sent"]), (1, 2, 3))
+        self.assertEqual(sink.messages, 3)
+
+    def test_dropped_session_is_replaced_and_the_message_sent(self):
+        sink = self.start_sink(disconnect_after=1)
+        pool = self.make_pool(sink, max_size=1)
+        for i in range(2):
+            pool.send_segments("from@example.com", ["to@example.com"], [f"Subject: {i}\r\n\r\nbody\r\n".encode()])
+        stats = pool.stats()
+        self.assertEqual((stats["opened"], stats["reconnects"], stats["sent"], stats["failed"]), (2, 1, 2, 0))
+        self.assertEqual(sink.messages, 2)
+
+    def test_dot_stuffing_across_segment_boundaries(self):
+        sink = self.start_sink(keep_messages=True)
+        pool = self.make_pool(sink)
+        segments = [
+            b"Subject: dots\r\n\r\nfirst line\r\n",
+            b".starts a line\r\nends mid-",  # line start: stuffed
+            b".line, not a line start\r\n",  # continues the previous line: not stuffed
+            _Body(b"..double\r\n", b".", b"\r\n", b"last\r\n"),
+        ]
+        pool.send_segments("from@example.com", ["to@example.com"], segments)
+        expected = b"".join(segments[:3]) + b"..double\r\n.\r\nlast\r\n"
+        self.assertEqual(sink.received, [expected])
+
+
+if __name__ == "__main__":
+    unittest.main()
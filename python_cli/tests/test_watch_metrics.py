@@ -0,0 +1,66 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import task_manager
+from bench import MemoryMongoClient
+
+
+class WatchRunMetricsTest(unittest.TestCase):
+    """Watch-triggered runs are recorded in the job metrics like scheduled ones."""
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.work_dir.cleanup)
+        previous_cwd = os.getcwd()
+        os.chdir(self.work_dir.name)  # task store, logs and indexes stay in the work dir
+        self.addCleanup(os.chdir, previous_cwd)
+        patcher = mock.patch.object(task_manager, "MongoClient", MemoryMongoClient)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = task_manager.TaskManager(worker=True)
+        self.addCleanup(self.manager._on_scheduler_shutdown, None)
+        self.directory = os.path.join(self.work_dir.name, "inbox")
+        os.makedirs(self.directory)
+
+    def _touch(self, name, age_days=0):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as f:
+            f.write("data")
+        if age_days:
+            old = time.time() - age_days * 86400
+            os.utime(path, (old, old))
+        return path
+
+    def _run_watch(self, task_name, details, paths):
+        self.manager._watch_callback(task_name, details)(paths)
+        return self.manager.metrics.summary()[task_name]
+
+    def test_organize_files_watch_run_is_a_success(self):
+        path = self._touch("photo.jpg")
+        details = {"task_type": "organize_files", "interval": 1, "unit": "hours", "directory": self.directory}
+        task = self._run_watch("organize_files_1", details, [path])
+        self.assertEqual(task["runs"], {"success": 1})
+        self.assertEqual(task["last_run"]["trigger"], "watch")
+        self.assertEqual(task["items"], {"files_moved": 1})
+
+    def test_delete_files_watch_run_is_a_success(self):
+        path = self._touch("old.log", age_days=30)
+        details = {
+            "task_type": "delete_files", "interval": 1, "unit": "hours",
+            "directory": self.directory, "age_days": 7, "formats": [".log"],
+        }
+        task = self._run_watch("delete_files_1", details, [path])
+        self.assertEqual(task["runs"], {"success": 1})
+        self.assertEqual(task["last_run"]["trigger"], "watch")
+        self.assertEqual(task["items"].get("files_deleted"), 1)
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+PYTHON_CLI = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Like app.py used to: a TaskManager and its scheduler thread built at import time.
+# "cpu" workers are spawned and re-import this script as __mp_main__.
+SCRIPT = textwrap.dedent("""
+    import json
+    import os
+    import sys
+    import threading
+    import time
+
+    sys.path.insert(0, {python_cli!r})
+    import task_manager
+    from apscheduler.events import EVENT_SCHEDULER_START
+    from bench import MemoryMongoClient
+
+    task_manager.MongoClient = MemoryMongoClient
+
+
+    def record_start(event):
+        with open("scheduler_starts.log", "a") as f:
+            f.write(f"{{os.getpid()}}\\n")
+
+
+    manager = task_manager.TaskManager()
+    manager.scheduler.add_listener(record_start, EVENT_SCHEDULER_START)
+    threading.Thread(target=manager.start_scheduler, daemon=True).start()
+
+    if __name__ == "__main__":
+        summary = manager._run_job("convert_file_1", (), "cpu", "convert_file", ("in", "out", "csv", "xlsx"), {{}})
+        time.sleep(1)  # give a scheduler re-started in the worker time to come up
+        manager.scheduler.shutdown()
+        print(json.dumps({{"pid": os.getpid(), "summary": summary}}))
+""")
+
+
+class CpuWorkerTest(unittest.TestCase):
+    """Spawned "cpu" workers must not bring up a second scheduler."""
+
+    def test_cpu_job_does_not_start_a_scheduler_in_the_worker(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            os.makedirs(os.path.join(work_dir, "in"))
+            with open(os.path.join(work_dir, "in", "table.csv"), "w") as f:
+                f.write("a,b\n1,2\n")
+            # A stored task, so a scheduler re-started in the worker would have a job to run.
+            with open(os.path.join(work_dir, "scheduled_tasks.json"), "w") as f:
+                json.dump({"convert_file_1": {
+                    "task_type": "convert_file", "interval": 1, "unit": "hours",
+                    "input_dir": "in", "output_dir": "out", "input_format": "csv", "output_format": "xlsx",
+                }}, f)
+            script = os.path.join(work_dir, "dashboard.py")
+            with open(script, "w") as f:
+                f.write(SCRIPT.format(python_cli=PYTHON_CLI))
+
+            result = subprocess.run(
+                [sys.executable, script], cwd=work_dir, capture_output=True, text=True, timeout=300,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            output = json.loads(result.stdout.strip().splitlines()[-1])
+            self.assertEqual(output["summary"]["converted"], 1)
+            with open(os.path.join(work_dir, "scheduler_starts.log")) as f:
+                starts = f.read().split()
+            self.assertEqual(starts, [str(output["pid"])])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# A file is picked up once it is fully written (close after write) or moved in.
+# IN_CREATE is only used to start watching new subdirectories.
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+_EVENT = struct.Struct("iIII")
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        _libc = libc
+    return _libc
+
+
+def inotify_available():
+    """Return True if inotify can be used on this platform."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        return hasattr(_load_libc(), "inotify_init1")
+    except OSError:
+        return False
+
+
+class DirectoryWatcher:
+    """Watch a directory with inotify and report changed files in debounced batches.
+
+    `on_change(paths)` is called from the watcher thread with the set of file
+    paths created, written or moved in since the last call, once no event has
+    arrived for `debounce` seconds (or after `max_delay` seconds of continuous
+    activity). It is called with None when the kernel event queue overflowed
+    and events were lost, meaning the caller should rescan everything.
+    Subdirectories are watched too when `recursive`, except those in `skip_dirs`.
+    """
+
+    def __init__(self, directory, on_change, recursive=False, debounce=1.0, max_delay=10.0,
+                 skip_dirs=(), logger=None):
+        self.directory = os.path.abspath(directory)
+        self.on_change = on_change
+        self.recursive = recursive
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.skip_dirs = {os.path.abspath(d) for d in skip_dirs}
+        self.logger = logger or logging.getLogger(__name__)
+        self._fd = None
+        self._wake_r = self._wake_w = None
+        self._watches = {}  # wd -> directory path
+        self._thread = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not inotify_available():
+            raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        libc = _load_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+        self._wake_r, self._wake_w = os.pipe()
+        self._add_tree(self.directory)
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=f"watch-{os.path.basename(self.directory)}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        if self._thread is None:
+            return
+        self._stopping.set()
+        os.write(self._wake_w, b"x")
+        self._thread.join(timeout)
+        self._thread = None
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            os.close(fd)
+        self._fd = self._wake_r = self._wake_w = None
+        self._watches.clear()
+
+    def _add_watch(self, path):
+        wd = _load_libc().inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                self.logger.warning(f"inotify watch limit reached; '{path}' is covered by the periodic reconcile only")
+            elif err not in (errno.ENOENT, errno.ENOTDIR):
+                raise OSError(err, os.strerror(err), path)
+            return False
+        self._watches[wd] = path
+        return True
+
+    def _add_tree(self, path, found=None):
+        """Watch `path` (and its subdirectories when recursive); collect files already in new dirs."""
+        if not self._add_watch(path) or not self.recursive:
+            return
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.path not in self.skip_dirs:
+                            self._add_tree(entry.path, found)
+                    elif found is not None and entry.is_file(follow_symlinks=False):
+                        found.add(entry.path)
+        except OSError:
+            pass
+
+    def _read_events(self, pending):
+        """Read queued events into `pending`; return False on queue overflow."""
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return True
+        ok = True
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                ok = False
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            parent = self._watches.get(wd)
+            if parent is None or not name:
+                continue
+            path = os.path.join(parent, name)
+            if mask & IN_ISDIR:
+                if self.recursive and mask & (IN_CREATE | IN_MOVED_TO) and path not in self.skip_dirs:
+                    # Files can land in a new directory before its watch exists.
+                    self._add_tree(path, pending)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                pending.add(path)
+        return ok
+
+    def _run(self):
+        pending = set()
+        overflowed = False
+        first_event = last_event = None
+        while not self._stopping.is_set():
+            timeout = None
+            if first_event is not None:
+                now = time.monotonic()
+                timeout = max(0.0, min(last_event + self.debounce, first_event + self.max_delay) - now)
+            readable, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+            if self._wake_r in readable:
+                break
+            now = time.monotonic()
+            if self._fd in readable:
+                if not self._read_events(pending):
+                    overflowed = True
+                if pending or overflowed:
+                    last_event = now
+                    first_event = first_event or now
+            if first_event is None:
+                continue
+            if now < last_event + self.debounce and now < first_event + self.max_delay:
+                continue
+            batch, pending = pending, set()
+            first_event = last_event = None
+            try:
+                self.on_change(None if overflowed else batch)
+            except Exception as e:
+                self.logger.error(f"Error handling changes in '{self.directory}': {e}")
+            overflowed = False